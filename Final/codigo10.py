@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verificación offline del modo ligero del pool de navegadores (codigo9.py).
+- Levanta un servidor local con una página de prueba que imita una partida
+  de rivalsmeta: imagen de héroe, fuente, vídeo y un script de "tracker"
+- Carga la página con un pool normal y con uno ligero y compara peticiones,
+  bytes servidos y tiempo de carga
+- Comprueba que el atributo `src` de la imagen del héroe sigue legible
+"""
+
+import os
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from selenium.webdriver.common.by import By
+
+from codigo9 import DriverPool
+
+FIXTURE_HTML = b"""<!doctype html>
+<html><head>
+<style>
+@font-face { font-family: Rivals; src: url('/fonts/rivals.woff2') format('woff2'); }
+body { font-family: Rivals, sans-serif; }
+</style>
+<script src="/tracker.js"></script>
+</head><body>
+<div class="matches"><div class="match-details"><table><tr>
+  <td class="hero"><img src="/img/img_selecthero_1024001.png"></td>
+  <td class="kda"><span class="avg">12 / 3 / 7</span></td>
+</tr></table></div></div>
+<video src="/media/intro.mp4" autoplay muted></video>
+</body></html>"""
+
+# Tamaño aproximado de cada recurso pesado
+FIXTURE_ASSETS = {
+    "/img/img_selecthero_1024001.png": ("image/png", 400_000),
+    "/fonts/rivals.woff2": ("font/woff2", 150_000),
+    "/media/intro.mp4": ("video/mp4", 1_000_000),
+    "/tracker.js": ("application/javascript", 80_000),
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    log = []
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/":
+            ctype, body = "text/html", FIXTURE_HTML
+        elif path in FIXTURE_ASSETS:
+            ctype, size = FIXTURE_ASSETS[path]
+            if ctype.endswith("javascript"):
+                body = b"/*" + b"x" * size + b"*/"
+            else:
+                body = os.urandom(size)
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+        _FixtureHandler.log.append((path, len(body)))
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server(port=0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(pool, url):
+    """Carga la página y devuelve (peticiones, bytes, segundos, src del héroe)."""
+    _FixtureHandler.log.clear()
+    with pool.driver() as driver:
+        start = time.perf_counter()
+        driver.get(url)
+        elapsed = time.perf_counter() - start
+        src = driver.find_element(By.CSS_SELECTOR, ".hero img").get_attribute("src")
+    time.sleep(0.5)  # peticiones tardías (vídeo)
+    requests = list(_FixtureHandler.log)
+    return requests, sum(size for _, size in requests), elapsed, src
+
+
+def main():
+    server = start_fixture_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    print("[+] Servidor de prueba en", url)
+
+    results = {}
+    for lean in (False, True):
+        pool = DriverPool(size=1, profile_root=".chrome_profiles_fixture", lean=lean,
+                          headless=True, blocked_patterns=["*/tracker.js"])
+        try:
+            results[lean] = measure(pool, url)
+        finally:
+            pool.close()
+    server.shutdown()
+
+    for lean, (requests, total, elapsed, src) in results.items():
+        mode = "ligero" if lean else "normal"
+        print(f"\n[►] Modo {mode}: {len(requests)} peticiones, {total/1024:.0f} KB, {elapsed:.2f} s")
+        for path, size in requests:
+            print(f"      - {path} ({size/1024:.0f} KB)")
+        print(f"    • src héroe: {src}")
+
+    lean_paths = {path for path, _ in results[True][0]}
+    blocked_ok = lean_paths <= {"/"}
+    src_ok = results[True][3].endswith("img_selecthero_1024001.png")
+    print(f"\n[{'✓' if blocked_ok else '!'}] Recursos pesados bloqueados en modo ligero")
+    print(f"[{'✓' if src_ok else '!'}] El DOM conserva el src de la imagen del héroe")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacén de features de contexto por partida.
+- Identificador estable de partida (match_uid) a partir del contenido del lobby
+- En una sola pasada agrupada y vectorizada: cuota de daño/curación/kills de
+  cada fila sobre su partida, rango dentro de la partida y z-score frente a
+  la media de la partida
+- Se persiste en CSV y solo se calculan las partidas que no estaban guardadas
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+STORE_FILE = 'rivals_context.csv'
+
+STATS = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing']
+SHARE_STATS = ['kills', 'damage', 'healing']
+
+CONTEXT_FEATURES = (
+    [f"{s}_share" for s in SHARE_STATS] +
+    [f"{s}_rank" for s in STATS] +
+    [f"{s}_z" for s in STATS]
+)
+
+
+def lobby_starts(df):
+    """
+    Posición de la primera fila de cada lobby. Las filas de un mismo lobby son
+    consecutivas y comparten `match`; si hay `match_key` (clave estable del
+    scraper, codigo16.py) también cortan sus cambios: en un CSV acumulado el
+    último lobby de un perfil y el primero del siguiente pueden tener el mismo
+    `match` (posición en su perfil) y se fundirían en uno.
+    """
+    match = df['match'].to_numpy()
+    change = match[1:] != match[:-1]
+    if 'match_key' in df.columns:
+        # Como texto: int, float (columna con NaN) o str según la fuente
+        key = df['match_key'].astype(str).to_numpy()
+        change |= key[1:] != key[:-1]
+    return np.flatnonzero(np.r_[True, change])
+
+
+def match_uid(df):
+    """
+    Id estable por partida: cada bloque de lobby_starts() se identifica por la
+    suma (módulo 2^64) de los hashes de sus filas, así que no depende del
+    jugador ni del fichero.
+    """
+    block_start = lobby_starts(df)
+    # dtype fijo: int64 y float64 (un CSV con algún NaN) darían hashes distintos
+    stats = df[STATS].apply(pd.to_numeric, errors='coerce').astype(np.float64)
+    row_hash = pd.util.hash_pandas_object(stats, index=False).to_numpy()
+    block_hash = np.add.reduceat(row_hash, block_start)
+    block_len = np.diff(np.r_[block_start, len(df)])
+    return pd.Series(
+        np.repeat(block_hash, block_len), index=df.index
+    ).map('{:016x}'.format)
+
+
+def compute_match_context(df, key='match_uid'):
+    """Features de contexto para todas las filas de `df` en un único groupby."""
+    grouped = df.groupby(key, sort=False)[STATS]
+    total = grouped.transform('sum')
+    mean = grouped.transform('mean')
+    std = grouped.transform('std', ddof=0).replace(0, np.nan)
+    rank = grouped.rank(ascending=False, method='min')
+
+    out = df[[key, 'row']].copy()
+    for s in SHARE_STATS:
+        out[f"{s}_share"] = (df[s] / total[s].replace(0, np.nan)).fillna(0.0)
+    for s in STATS:
+        out[f"{s}_rank"] = rank[s].astype(int)
+    for s in STATS:
+        out[f"{s}_z"] = ((df[s] - mean[s]) / std[s]).fillna(0.0)
+    return out
+
+
+def update_feature_store(df, path=STORE_FILE):
+    """
+    Añade al almacén las partidas nuevas de `df` y devuelve el almacén completo.
+    Las partidas ya guardadas (mismo match_uid) no se recalculan.
+    """
+    df = df.copy()
+    df['match_uid'] = match_uid(df)
+
+    if os.path.exists(path):
+        # round_trip: las features leídas son idénticas bit a bit a las calculadas
+        store = pd.read_csv(path, dtype={'match_uid': str}, float_precision='round_trip')
+    else:
+        store = pd.DataFrame(columns=['match_uid', 'row'] + CONTEXT_FEATURES)
+
+    new = df[~df['match_uid'].isin(store['match_uid'])]
+    new = new.drop_duplicates(['match_uid', 'row'])
+    if not new.empty:
+        fresh = compute_match_context(new)
+        store = fresh if store.empty else pd.concat([store, fresh], ignore_index=True)
+        store.to_csv(path, index=False, encoding='utf-8')
+        print(f"[+] Contexto calculado para {new['match_uid'].nunique()} partidas nuevas "
+              f"({len(store)} filas en '{path}').")
+    else:
+        print(f"[*] Sin partidas nuevas; contexto leído de '{path}'.")
+    return store
+
+
+def add_context_features(df, path=STORE_FILE):
+    """Devuelve `df` con match_uid y las columnas de contexto del almacén."""
+    store = update_feature_store(df, path)
+    out = df.copy()
+    out['match_uid'] = match_uid(out)
+    return out.merge(store, on=['match_uid', 'row'], how='left')
+
+
+if __name__ == "__main__":
+    data = pd.read_csv('rivals_data.csv')
+    enriched = add_context_features(data)
+    print(enriched[['match', 'row', 'hero_name'] + CONTEXT_FEATURES[:3]].head(12))
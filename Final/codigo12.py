@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Co-ocurrencia de héroes y lift de MVP por pareja, con matrices dispersas.
+- Matriz de incidencia partidas x héroes a partir de las columnas match/hero_id
+- Co-ocurrencia = P^T P; tasas de MVP por pareja = MVP^T P / APARICIONES^T P
+- Actualización incremental: solo se multiplican las partidas nuevas
+- Consulta "mejores compañeros del héroe X" sobre una fila de la matriz
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from codigo11 import match_uid
+
+HERO_FILE = 'marvel_hero_ids.csv'
+STORE_FILE = 'hero_pairs.npz'
+
+
+def _normalize_hero_ids(series):
+    """hero_id llega como texto, entero o float (1026001.0) según el CSV."""
+    return pd.to_numeric(series, errors='coerce').astype('Int64').astype(str)
+
+
+class HeroPairMatrix:
+    def __init__(self, hero_file=HERO_FILE):
+        heroes = pd.read_csv(hero_file, dtype={'hero_id': str})
+        self.hero_ids = heroes['hero_id'].tolist()
+        self.hero_names = dict(zip(heroes['hero_id'], heroes['hero_name']))
+        self.index = {h: i for i, h in enumerate(self.hero_ids)}
+        n = len(self.hero_ids)
+
+        # together[a, b]: partidas con a y b en el lobby
+        # appear[a, b]:   filas del héroe a en partidas donde está b
+        # mvp[a, b]:      de esas filas, cuántas fueron MVP/SVP
+        self.together = sp.csr_matrix((n, n), dtype=np.int64)
+        self.appear = sp.csr_matrix((n, n), dtype=np.int64)
+        self.mvp = sp.csr_matrix((n, n), dtype=np.int64)
+        self.seen = set()
+
+    def _incidence(self, df):
+        uids = df['match_uid'].to_numpy()
+        match_codes, match_idx = np.unique(uids, return_inverse=True)
+        hero_idx = df['hero_id'].map(self.index).to_numpy()
+        shape = (len(match_codes), len(self.hero_ids))
+
+        rows_per_hero = sp.csr_matrix(
+            (np.ones(len(df), dtype=np.int64), (match_idx, hero_idx)), shape=shape
+        )
+        mvp_per_hero = sp.csr_matrix(
+            (df['mvp'].to_numpy().astype(np.int64), (match_idx, hero_idx)), shape=shape
+        )
+        presence = (rows_per_hero > 0).astype(np.int64)
+        return presence, rows_per_hero, mvp_per_hero
+
+    def update(self, df):
+        """Incorpora las partidas de `df` que aún no se habían contado."""
+        df = df.copy()
+        if 'match_uid' not in df.columns:
+            df['match_uid'] = match_uid(df)
+        df['hero_id'] = _normalize_hero_ids(df['hero_id'])
+        df['mvp'] = df['mvp'].astype(str).str.lower().eq('true')
+        df = df[df['hero_id'].isin(self.index)]
+        df = df[~df['match_uid'].isin(self.seen)].drop_duplicates(['match_uid', 'row'])
+        if df.empty:
+            return 0
+
+        presence, rows_per_hero, mvp_per_hero = self._incidence(df)
+        self.together = self.together + presence.T @ presence
+        self.appear = self.appear + rows_per_hero.T @ presence
+        self.mvp = self.mvp + mvp_per_hero.T @ presence
+        new_matches = df['match_uid'].unique()
+        self.seen.update(new_matches)
+        return len(new_matches)
+
+    def mvp_lift(self):
+        """
+        lift[a, b] = tasa MVP de a cuando b está en el lobby / tasa MVP global de a.
+        Solo se calcula sobre las entradas no nulas (resultado disperso).
+        """
+        base = self.mvp.diagonal() / np.maximum(self.appear.diagonal(), 1)
+        appear = self.appear.tocoo()
+        mvp = self.mvp.tocsr()[appear.row, appear.col].A1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lift = (mvp / appear.data) / base[appear.row]
+        lift = np.nan_to_num(lift, nan=0.0, posinf=0.0)
+        return sp.csr_matrix((lift, (appear.row, appear.col)), shape=self.appear.shape)
+
+    def top_partners(self, hero, k=5, by='together', min_matches=10):
+        """
+        Mejores compañeros de `hero` (id o nombre): por partidas juntos
+        (by='together') o por lift de MVP (by='lift').
+        """
+        if hero not in self.index:
+            by_name = {name: hid for hid, name in self.hero_names.items()}
+            hero = by_name[hero]
+        a = self.index[hero]
+
+        counts = self.together.getrow(a).toarray().ravel()
+        scores = counts if by == 'together' else self.mvp_lift().getrow(a).toarray().ravel()
+        scores = np.where((counts >= min_matches) & (np.arange(len(counts)) != a), scores, -np.inf)
+        k = min(k, int(np.isfinite(scores).sum()))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=int)
+        top = top[np.argsort(-scores[top])]
+        return pd.DataFrame({
+            'hero_id': [self.hero_ids[i] for i in top],
+            'hero_name': [self.hero_names[self.hero_ids[i]] for i in top],
+            'matches_together': counts[top],
+            by: scores[top],
+        })
+
+    def save(self, path=STORE_FILE):
+        # Solo las celdas no nulas (componentes COO), no la matriz densa
+        arrays = {'hero_ids': np.array(self.hero_ids), 'seen': np.array(sorted(self.seen))}
+        for name in ('together', 'appear', 'mvp'):
+            coo = getattr(self, name).tocoo()
+            arrays.update({f"{name}_row": coo.row, f"{name}_col": coo.col, f"{name}_data": coo.data})
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path=STORE_FILE, hero_file=HERO_FILE):
+        pairs = cls(hero_file)
+        if not os.path.exists(path):
+            return pairs
+        data = np.load(path)
+        if data['hero_ids'].tolist() != pairs.hero_ids or 'together_data' not in data.files:
+            print(f"[!] El registro de héroes o el formato cambió; se reconstruye '{path}'.")
+            return pairs
+        n = len(pairs.hero_ids)
+        for name in ('together', 'appear', 'mvp'):
+            setattr(pairs, name, sp.csr_matrix(
+                (data[f"{name}_data"], (data[f"{name}_row"], data[f"{name}_col"])), shape=(n, n)
+            ))
+        pairs.seen = set(data['seen'].tolist())
+        return pairs
+
+
+if __name__ == "__main__":
+    pairs = HeroPairMatrix.load()
+    added = pairs.update(pd.read_csv('rivals_data.csv'))
+    pairs.save()
+    print(f"[+] {added} partidas nuevas; {len(pairs.seen)} partidas en '{STORE_FILE}'.")
+    print("\nCompañeros más frecuentes de Hela:\n", pairs.top_partners('Hela'))
+    print("\nMayor lift de MVP para Hela:\n", pairs.top_partners('Hela', by='lift'))
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Validación vectorizada de lotes de filas scrapeadas, con cuarentena.
+- Reglas sobre columnas completas (sin bucles por fila): tipos numéricos,
+  rangos de K/D/A, daño/curación no negativos, hero_id en el registro, rol
+  coherente con el héroe y un único MVP/SVP por equipo
+- mvp normalizado a booleano ('TRUE', 'True', True... -> True)
+- Las filas que fallan van a un CSV de cuarentena con sus motivos en vez de
+  perderse; las válidas siguen el flujo normal
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from codigo11 import lobby_starts
+from codigo25 import HERO_MAP, HERO_ROLE_MAP
+
+QUARANTINE_FILE = 'rivals_quarantine.csv'
+
+QUARANTINE_COLUMNS = [
+    'match', 'row', 'kills', 'deaths', 'assists', 'damage', 'dmg_taken',
+    'healing', 'mvp', 'hero_id', 'hero_name', 'role', 'player_id', 'raw', 'reasons'
+]
+NUMERIC = ['match', 'row', 'kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing', 'role']
+KDA_LIMITS = {'kills': 100, 'deaths': 100, 'assists': 150}
+TEAM_SIZE = 6
+
+# Registro ordenado para búsquedas con searchsorted
+_REGISTRY_IDS = np.array(sorted(int(h) for h in HERO_MAP), dtype=np.int64)
+_REGISTRY_ROLES = np.array([HERO_ROLE_MAP[str(h)] for h in _REGISTRY_IDS], dtype=np.int64)
+
+# Un bit por regla; los motivos se componen solo para las filas que fallan
+RULES = [
+    'valor no numérico o faltante',
+    'K/D/A fuera de rango',
+    'daño/curación negativos',
+    'mvp no booleano',
+    'hero_id fuera del registro',
+    'rol incoherente con el héroe',
+    'equipo sin un único MVP/SVP',
+]
+
+
+def normalize_mvp(series):
+    """Devuelve (mvp booleano, máscara de valores no reconocidos)."""
+    if series.dtype == bool:
+        return series.to_numpy(), np.zeros(len(series), dtype=bool)
+    text = series.astype(str).str.strip().str.lower()
+    is_true = text.isin(['true', '1', '1.0']).to_numpy()
+    is_false = text.isin(['false', '0', '0.0']).to_numpy()
+    return is_true, ~(is_true | is_false)
+
+
+def _team_mvp_mask(starts, mvp):
+    """
+    Filas de equipos sin exactamente un MVP/SVP. `starts` son los inicios de
+    lobby (codigo11.lobby_starts); los equipos se infieren de la posición
+    dentro de la partida y solo se comprueban lobbies completos (12).
+    """
+    n = len(mvp)
+    lengths = np.diff(np.r_[starts, n])
+    pos = np.arange(n) - np.repeat(starts, lengths)
+    full = np.repeat(lengths == 2 * TEAM_SIZE, lengths)
+
+    team_start = np.flatnonzero((pos == 0) | (pos == TEAM_SIZE))
+    team_len = np.diff(np.r_[team_start, n])
+    team_mvps = np.add.reduceat(mvp.astype(np.int64), team_start)
+    return full & np.repeat(team_mvps != 1, team_len)
+
+
+def validate_batch(df):
+    """
+    Valida un DataFrame completo. Devuelve (válidas, cuarentena); la cuarentena
+    conserva las columnas originales más `reasons`.
+    """
+    n = len(df)
+    nums = {c: pd.to_numeric(df[c], errors='coerce').to_numpy(dtype=np.float64) for c in NUMERIC}
+    hero = pd.to_numeric(df['hero_id'], errors='coerce').to_numpy(dtype=np.float64)
+    mvp, bad_mvp = normalize_mvp(df['mvp'])
+
+    fails = np.zeros(n, dtype=np.int64)
+
+    missing = np.zeros(n, dtype=bool)
+    for c in NUMERIC:
+        missing |= np.isnan(nums[c])
+    fails |= missing << 0
+
+    kda_bad = np.zeros(n, dtype=bool)
+    for c, limit in KDA_LIMITS.items():
+        kda_bad |= (nums[c] < 0) | (nums[c] > limit) | (nums[c] != np.floor(nums[c]))
+    fails |= (kda_bad & ~missing) << 1
+
+    neg = (nums['damage'] < 0) | (nums['dmg_taken'] < 0) | (nums['healing'] < 0)
+    fails |= neg << 2
+    fails |= bad_mvp << 3
+
+    hero_int = np.nan_to_num(hero, nan=-1).astype(np.int64)
+    pos = np.clip(np.searchsorted(_REGISTRY_IDS, hero_int), 0, len(_REGISTRY_IDS) - 1)
+    known = _REGISTRY_IDS[pos] == hero_int
+    fails |= ~known << 4
+    fails |= (known & (_REGISTRY_ROLES[pos] != nums['role'])) << 5
+
+    lobbies = pd.DataFrame({'match': np.nan_to_num(nums['match'], nan=-1)}, index=df.index)
+    if 'match_key' in df.columns:
+        lobbies['match_key'] = df['match_key']
+    fails |= _team_mvp_mask(lobby_starts(lobbies), mvp) << 6
+
+    ok = fails == 0
+    valid = df[ok].copy()
+    valid['mvp'] = mvp[ok]
+    valid['hero_id'] = hero_int[ok]
+    for c in NUMERIC:
+        valid[c] = nums[c][ok].astype(np.int64)
+
+    quarantine = df[~ok].copy()
+    bad_bits = fails[~ok]
+    quarantine['reasons'] = [
+        '; '.join(r for b, r in enumerate(RULES) if bits >> b & 1) for bits in bad_bits
+    ]
+    return valid, quarantine
+
+
+def write_quarantine(quarantine, path=QUARANTINE_FILE):
+    """Añade las filas en cuarentena al fichero (cabecera solo si es nuevo)."""
+    if quarantine.empty:
+        return
+    quarantine = quarantine.reindex(columns=QUARANTINE_COLUMNS)
+    quarantine.to_csv(path, mode='a', header=not os.path.exists(path), index=False, encoding='utf-8')
+    print(f"[!] {len(quarantine)} filas enviadas a cuarentena en '{path}'.")
+
+
+def validate_and_quarantine(df, path=QUARANTINE_FILE):
+    valid, quarantine = validate_batch(df)
+    write_quarantine(quarantine, path)
+    print(f"[+] Validación: {len(valid)} filas válidas, {len(quarantine)} en cuarentena.")
+    return valid
+
+
+if __name__ == "__main__":
+    data = pd.read_csv('rivals_data.csv')
+    valid, quarantine = validate_batch(data)
+    print(f"[+] {len(valid)} válidas, {len(quarantine)} en cuarentena")
+    print(quarantine['reasons'].value_counts())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de vecinos más cercanos para similitud de jugadores y partidas.
+- Un vector por entidad (jugador, jugador+héroe, rol, partida...) con la
+  media de K/D/A, daño, daño recibido, curación y la tasa de MVP
+- Normalizado con StandardScaler, igual que en analyze_role (codigo6.py)
+- BallTree para distancia euclídea y producto matricial para coseno
+- Actualización incremental: se acumulan sumas y conteos por entidad y el
+  árbol se reconstruye solo cuando hay filas nuevas y llega una consulta
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+from sklearn.preprocessing import StandardScaler
+
+from codigo11 import match_uid
+
+FEATURES = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing', 'mvp']
+
+
+class SimilarityIndex:
+    def __init__(self, by=('player_id', 'hero_id'), min_rows=5):
+        self.by = list(by)
+        self.min_rows = min_rows
+        self._sums = pd.DataFrame(columns=FEATURES + ['n'], dtype=np.float64)
+        self._dirty = True
+        self.keys = None
+        self.vectors = None
+        self._tree = None
+        self._unit = None
+
+    def update(self, df):
+        """Suma las filas nuevas a los acumulados por entidad: O(filas nuevas)."""
+        df = df.copy()
+        if 'match_uid' in self.by and 'match_uid' not in df.columns:
+            df['match_uid'] = match_uid(df)
+        df['mvp'] = df['mvp'].astype(str).str.lower().eq('true').astype(np.float64)
+        df = df.dropna(subset=self.by)
+        grouped = df.groupby(self.by)[FEATURES].sum()
+        grouped['n'] = df.groupby(self.by).size()
+        if self._sums.empty:
+            self._sums = grouped.astype(np.float64)
+        else:
+            self._sums = self._sums.add(grouped, fill_value=0)
+        self._dirty = True
+
+    def build(self):
+        sums = self._sums[self._sums['n'] >= self.min_rows]
+        means = sums[FEATURES].div(sums['n'], axis=0)
+        self.keys = means.index
+        self.vectors = StandardScaler().fit_transform(means.to_numpy())
+        self._tree = BallTree(self.vectors)
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        self._unit = self.vectors / np.where(norms == 0, 1, norms)
+        self._dirty = False
+
+    def _position(self, key):
+        try:
+            return self.keys.get_loc(key)
+        except KeyError:
+            raise KeyError(f"{key} no está en el índice (o tiene < {self.min_rows} filas)")
+
+    def query(self, key, k=5, metric='euclidean'):
+        """Las k entidades más parecidas a `key` (excluida ella misma)."""
+        if self._dirty:
+            self.build()
+        pos = self._position(key)
+        k = min(k, len(self.keys) - 1)
+        if metric == 'cosine':
+            sims = self._unit @ self._unit[pos]
+            sims[pos] = -np.inf
+            top = np.argpartition(-sims, k - 1)[:k]
+            top = top[np.argsort(-sims[top])]
+            scores = 1 - sims[top]
+        else:
+            dist, idx = self._tree.query(self.vectors[pos:pos + 1], k=k + 1)
+            keep = idx[0] != pos
+            top, scores = idx[0][keep][:k], dist[0][keep][:k]
+        result = self.keys[top].to_frame(index=False)
+        result['distance'] = scores
+        result['rows'] = self._sums.loc[self.keys[top], 'n'].to_numpy().astype(int)
+        return result
+
+
+if __name__ == "__main__":
+    import time
+
+    data = pd.read_csv('rivals_data.csv')
+    # Los CSV antiguos no tienen player_id: se demuestra por héroe y por partida
+    heroes = SimilarityIndex(by=['hero_id'])
+    heroes.update(data)
+    print("[►] Héroes que se juegan como Hela:\n", heroes.query(1024001.0))
+
+    matches = SimilarityIndex(by=['match_uid'], min_rows=1)
+    matches.update(data)
+    matches.build()
+    first = matches.keys[0]
+    start = time.perf_counter()
+    print(f"\n[►] Partidas parecidas a {first}:\n", matches.query(first, metric='cosine'))
+    print(f"    • consulta en {1000 * (time.perf_counter() - start):.2f} ms")
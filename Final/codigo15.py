@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archivo direccionado por contenido de páginas de jugador ya expandidas.
+- Cada HTML se guarda comprimido con zstd bajo su hash SHA-256: la misma
+  página capturada dos veces ocupa un solo fichero
+- index.jsonl registra qué jugador y cuándo se capturó cada hash
+- Modo replay: re-ejecuta el parser actual (codigo3.parse_player_page) sobre
+  todo el archivo en paralelo, sin navegador, y regenera el CSV
+Requiere: zstandard (pip install zstandard)
+Uso: python codigo15.py [salida.csv]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import zstandard as zstd
+
+from codigo3 import parse_player_page, save_to_csv
+from codigo11 import match_uid
+from codigo13 import validate_and_quarantine, write_quarantine
+
+ARCHIVE_ROOT = 'page_archive'
+ZSTD_LEVEL = 10
+
+
+class PageArchive:
+    def __init__(self, root=ARCHIVE_ROOT):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.jsonl')
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, digest):
+        # Dos niveles para no acumular miles de ficheros en un directorio
+        return os.path.join(self.root, digest[:2], f"{digest}.html.zst")
+
+    def put(self, html, player_id):
+        """Guarda la página si su contenido es nuevo; devuelve el hash."""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+            os.replace(tmp, path)
+            print(f"[+] Página archivada: {digest[:12]} ({len(data)/1024:.0f} KB sin comprimir)")
+        else:
+            print(f"[*] Página ya archivada: {digest[:12]}")
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                "hash": digest, "player_id": str(player_id), "captured_at": time.time()
+            }) + "\n")
+        return digest
+
+    def get(self, digest):
+        with open(self._path(digest), 'rb') as f:
+            return zstd.ZstdDecompressor().decompress(f.read()).decode('utf-8')
+
+    def entries(self):
+        """Entradas del índice, una por hash (la captura más reciente)."""
+        if not os.path.exists(self.index_path):
+            return []
+        latest = {}
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                latest[entry['hash']] = entry
+        return sorted(latest.values(), key=lambda e: e['captured_at'])
+
+
+def _replay_one(args):
+    root, entry = args
+    html = PageArchive(root).get(entry['hash'])
+    rows, errors = parse_player_page(html, player_id=entry['player_id'])
+    # match_uid por página: los bloques de partida de páginas distintas no se mezclan
+    if rows:
+        for item, uid in zip(rows, match_uid(pd.DataFrame(rows))):
+            item['match_uid'] = uid
+    for item in rows + errors:
+        item['profile_id'] = entry['player_id']
+    return rows, errors
+
+
+def replay(out_csv='rivals_data_replay.csv', root=ARCHIVE_ROOT, workers=None):
+    """Regenera el dataset desde el archivo con el parser actual, en paralelo."""
+    entries = PageArchive(root).entries()
+    if not entries:
+        print(f"[!] El archivo '{root}' está vacío.")
+        return None
+    print(f"[+] Re-parseando {len(entries)} páginas archivadas...")
+
+    start = time.perf_counter()
+    all_rows, all_errors = [], []
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for rows, errors in ex.map(_replay_one, [(root, e) for e in entries]):
+            all_rows.extend(rows)
+            all_errors.extend(errors)
+    print(f"[+] {len(all_rows)} filas en {time.perf_counter() - start:.1f} s")
+
+    write_quarantine(pd.DataFrame(all_errors))
+    if not all_rows:
+        return None
+    # Re-capturas del mismo perfil y perfiles solapados traen el mismo lobby:
+    # se queda la copia de la captura más reciente (las entradas van en orden)
+    data = pd.DataFrame(all_rows)
+    repeated = data.duplicated(['match_uid', 'row'], keep='last')
+    if repeated.any():
+        print(f"[*] Descartadas {repeated.sum()} filas de lobbies repetidos entre capturas")
+    data = data[~repeated].drop(columns='match_uid')
+    valid = validate_and_quarantine(data)
+    save_to_csv(valid.to_dict('records'), out_csv)
+    return valid
+
+
+if __name__ == "__main__":
+    replay(*sys.argv[1:2])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filtro compartido de partidas ya capturadas (deduplicación entre jugadores).
+- Cada partida se identifica por una clave estable que se lee ANTES de
+  expandirla: el enlace de la partida (`a.match[href]`) si lo tiene, o el
+  texto de su cabecera junto al perfil como último recurso
+- Las claves se guardan como enteros de 64 bits en una tabla SQLite
+  (WITHOUT ROWID, modo WAL): persiste entre ejecuciones y la comparten
+  varios procesos/workers a la vez
+- claim() es atómico: solo el primer worker que reclama una partida la procesa
+"""
+
+import re
+import sqlite3
+import hashlib
+
+SEEN_DB = 'seen_matches.db'
+
+# Lee clave de todas las partidas nuevas en un solo viaje al navegador
+MATCH_KEYS_JS = """
+return arguments[0].map(m => {
+    const a = m.querySelector('a.match');
+    return [a ? (a.getAttribute('href') || '') : '', (a || m).innerText.slice(0, 300)];
+});
+"""
+
+
+def match_key(href, header_text, player_id):
+    """
+    Clave de 64 bits con signo. Un href con id numérico es común a todos los
+    jugadores del lobby; la cabecera solo deduplica re-crawls del mismo perfil.
+    """
+    if href and re.search(r"\d{4,}", href):
+        source = f"href:{href.split('?')[0].rstrip('/')}"
+    else:
+        source = f"text:{player_id}:{' '.join(header_text.split())}"
+    digest = hashlib.blake2b(source.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class SeenMatches:
+    def __init__(self, path=SEEN_DB):
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY) WITHOUT ROWID"
+        )
+
+    def claim(self, key):
+        """True si la partida no se había visto (y queda reclamada)."""
+        cur = self._conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+        return cur.rowcount == 1
+
+    def claim_many(self, keys):
+        """Reclama un lote en una sola transacción; devuelve un bool por clave."""
+        claimed = []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for key in keys:
+                cur = self._conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+                claimed.append(cur.rowcount == 1)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return claimed
+
+    def release(self, key):
+        """Libera una partida reclamada que no se pudo extraer."""
+        self._conn.execute("DELETE FROM seen WHERE key = ?", (key,))
+
+    def release_many(self, keys):
+        """Libera un lote de claves en una sola transacción."""
+        with self._conn:
+            self._conn.executemany("DELETE FROM seen WHERE key = ?", [(k,) for k in keys])
+
+    def __contains__(self, key):
+        return self._conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
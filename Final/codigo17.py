@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cola de trabajos con leases para repartir scrape_player entre varias máquinas.
+- Cada nodo pide un player_id, lo scrapea y marca el trabajo como hecho
+- El lease caduca si el nodo deja de enviar heartbeats; el trabajo vuelve a
+  la cola automáticamente y lo recoge otro nodo
+- Solo el dueño vigente del lease puede completarlo: no hay doble scrapeo
+- Backends intercambiables: SQLiteJobStore (fichero compartido entre nodos)
+  y MemoryJobStore (mismo proceso, para pruebas locales)
+Uso:
+    python codigo17.py add 209656717 1044438082 ...
+    python codigo17.py work
+    python codigo17.py stats
+Nota: SQLite sobre almacenamiento en red necesita bloqueos de fichero fiables
+(SMB/NFSv4 con locks); con NFS antiguo conviene un backend servidor.
+"""
+
+import sys
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+
+JOBS_DB = 'crawl_jobs.db'
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+
+class SQLiteJobStore:
+    def __init__(self, path=JOBS_DB, max_attempts=MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()  # la conexión se comparte con el hilo de heartbeat
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                player_id   TEXT PRIMARY KEY,
+                status      TEXT NOT NULL DEFAULT 'pending',
+                node        TEXT,
+                lease_until REAL,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                error       TEXT,
+                updated     REAL
+            )
+        """)
+
+    def _tx(self, fn):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def add(self, player_ids):
+        now = time.time()
+        return self._tx(lambda c: sum(
+            c.execute("INSERT OR IGNORE INTO jobs (player_id, updated) VALUES (?, ?)",
+                      (str(p), now)).rowcount
+            for p in player_ids
+        ))
+
+    def lease(self, node, lease_seconds=LEASE_SECONDS):
+        """Siguiente trabajo pendiente o con lease caducado; None si no hay."""
+        def take(c):
+            now = time.time()
+            # Un lease caducado es un intento fallido (el nodo murió): agotados
+            # los intentos, el trabajo no vuelve a la cola
+            c.execute("""
+                UPDATE jobs SET status = 'failed', lease_until = NULL,
+                                error = 'lease caducado', updated = ?
+                WHERE status = 'leased' AND lease_until < ? AND attempts >= ?
+            """, (now, now, self.max_attempts))
+            row = c.execute("""
+                SELECT player_id FROM jobs
+                WHERE status = 'pending' OR (status = 'leased' AND lease_until < ?)
+                ORDER BY attempts, updated LIMIT 1
+            """, (now,)).fetchone()
+            if row is None:
+                return None
+            c.execute("""
+                UPDATE jobs SET status = 'leased', node = ?, lease_until = ?,
+                                attempts = attempts + 1, updated = ?
+                WHERE player_id = ?
+            """, (node, now + lease_seconds, now, row[0]))
+            return row[0]
+        return self._tx(take)
+
+    def heartbeat(self, player_id, node, lease_seconds=LEASE_SECONDS):
+        """Renueva el lease; False si ya no pertenece a este nodo."""
+        now = time.time()
+        return self._tx(lambda c: c.execute("""
+            UPDATE jobs SET lease_until = ?, updated = ?
+            WHERE player_id = ? AND node = ? AND status = 'leased'
+        """, (now + lease_seconds, now, player_id, node)).rowcount == 1)
+
+    def complete(self, player_id, node):
+        return self._tx(lambda c: c.execute("""
+            UPDATE jobs SET status = 'done', lease_until = NULL, updated = ?
+            WHERE player_id = ? AND node = ? AND status = 'leased'
+        """, (time.time(), player_id, node)).rowcount == 1)
+
+    def fail(self, player_id, node, error):
+        """Devuelve el trabajo a la cola, o lo marca 'failed' tras MAX_ATTEMPTS."""
+        return self._tx(lambda c: c.execute("""
+            UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                            lease_until = NULL, error = ?, updated = ?
+            WHERE player_id = ? AND node = ? AND status = 'leased'
+        """, (self.max_attempts, str(error), time.time(), player_id, node)).rowcount == 1)
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def next_expiry(self):
+        """Vencimiento más próximo entre los leases vigentes (None si no hay)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT MIN(lease_until) FROM jobs WHERE status = 'leased'"
+            ).fetchone()[0]
+
+
+class MemoryJobStore:
+    """Misma semántica que SQLiteJobStore, en memoria (para pruebas)."""
+
+    def __init__(self, max_attempts=MAX_ATTEMPTS):
+        self.max_attempts = max_attempts
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add(self, player_ids):
+        with self._lock:
+            added = 0
+            for p in map(str, player_ids):
+                if p not in self._jobs:
+                    self._jobs[p] = {'status': 'pending', 'node': None, 'lease_until': None,
+                                     'attempts': 0, 'error': None, 'updated': time.time()}
+                    added += 1
+            return added
+
+    def lease(self, node, lease_seconds=LEASE_SECONDS):
+        with self._lock:
+            now = time.time()
+            for job in self._jobs.values():
+                if (job['status'] == 'leased' and job['lease_until'] < now
+                        and job['attempts'] >= self.max_attempts):
+                    job.update(status='failed', lease_until=None, error='lease caducado', updated=now)
+            ready = [
+                (job['attempts'], job['updated'], p) for p, job in self._jobs.items()
+                if job['status'] == 'pending'
+                or (job['status'] == 'leased' and job['lease_until'] < now)
+            ]
+            if not ready:
+                return None
+            p = min(ready)[2]
+            self._jobs[p].update(status='leased', node=node, lease_until=now + lease_seconds,
+                                 attempts=self._jobs[p]['attempts'] + 1, updated=now)
+            return p
+
+    def _owned(self, player_id, node):
+        job = self._jobs.get(player_id)
+        return job is not None and job['node'] == node and job['status'] == 'leased'
+
+    def heartbeat(self, player_id, node, lease_seconds=LEASE_SECONDS):
+        with self._lock:
+            if not self._owned(player_id, node):
+                return False
+            self._jobs[player_id].update(lease_until=time.time() + lease_seconds, updated=time.time())
+            return True
+
+    def complete(self, player_id, node):
+        with self._lock:
+            if not self._owned(player_id, node):
+                return False
+            self._jobs[player_id].update(status='done', lease_until=None, updated=time.time())
+            return True
+
+    def fail(self, player_id, node, error):
+        with self._lock:
+            if not self._owned(player_id, node):
+                return False
+            job = self._jobs[player_id]
+            status = 'failed' if job['attempts'] >= self.max_attempts else 'pending'
+            job.update(status=status, lease_until=None, error=str(error), updated=time.time())
+            return True
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return counts
+
+    def next_expiry(self):
+        with self._lock:
+            leases = [j['lease_until'] for j in self._jobs.values() if j['status'] == 'leased']
+            return min(leases, default=None)
+
+
+def _heartbeat_loop(store, player_id, node, lease_seconds, stop):
+    while not stop.wait(lease_seconds / 3):
+        if not store.heartbeat(player_id, node, lease_seconds):
+            print(f"[!] Lease de {player_id} perdido por el nodo {node}")
+            return
+
+
+def run_node(store, scrape=None, node=None, lease_seconds=LEASE_SECONDS, idle_exit=True, poll=10):
+    """
+    Bucle de un nodo: lease -> scrape -> complete. `scrape(player_id)` es por
+    defecto codigo3.scrape_player con un CSV por jugador; si lanza una
+    excepción o devuelve 0 (ninguna partida cargada) el trabajo se marca fallido.
+    Con idle_exit el nodo sale cuando no quedan trabajos pendientes ni en lease.
+    """
+    if scrape is None:
+        from codigo3 import scrape_player
+        scrape = lambda pid: scrape_player(pid, filename=f"rivals_data_{pid}.csv")
+    node = node or f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
+    done = 0
+    print(f"[+] Nodo {node} listo.")
+    while True:
+        player_id = store.lease(node, lease_seconds)
+        if player_id is None:
+            if idle_exit:
+                counts = store.stats()
+                if not counts.get('leased') and not counts.get('pending'):
+                    break
+                # Otro nodo aún tiene leases: si muere, alguien tiene que seguir
+                # vivo para recoger el trabajo cuando caduque
+                expiry = store.next_expiry()
+                if expiry is not None:
+                    time.sleep(min(poll, max(expiry - time.time(), 0.0)))
+                continue
+            time.sleep(poll)
+            continue
+
+        print(f"\n[►] Nodo {node}: jugador {player_id}")
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat_loop,
+                                args=(store, player_id, node, lease_seconds, stop), daemon=True)
+        beat.start()
+        try:
+            found = scrape(player_id)
+            if found == 0:
+                raise RuntimeError("el perfil no cargó ninguna partida")
+        except Exception as e:
+            stop.set()
+            store.fail(player_id, node, e)
+            print(f"    ! Falló {player_id}: {e}")
+            continue
+        stop.set()
+        if store.complete(player_id, node):
+            done += 1
+        else:
+            print(f"    ! {player_id} ya no era de este nodo; resultado descartado de la cola")
+
+    print(f"[*] Nodo {node} sin trabajo: {done} jugadores completados. Estado: {store.stats()}")
+    return done
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "work"
+    jobs = SQLiteJobStore()
+    if command == "add":
+        print(f"[+] {jobs.add(sys.argv[2:])} trabajos nuevos en '{JOBS_DB}'.")
+    elif command == "stats":
+        print(jobs.stats())
+    else:
+        run_node(jobs)
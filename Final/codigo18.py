@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reparto del dataset a workers de análisis mediante memoria compartida.
+- Las columnas (kills..healing, mvp, role, hero_id, contexto...) se copian
+  UNA vez a bloques de shared_memory; las de texto van como códigos enteros
+  y sus valores distintos viajan en el `spec`
+- Cada columna recupera en el worker su dtype original (mvp sigue siendo
+  bool): la salida en paralelo es la misma que en serie
+- Cada worker se adjunta al arrancar (sin copia) y recibe solo arrays de
+  índices con sus filas: más núcleos no significa más copias del dataset
+- run_parallel(df, grupos, func) reparte grupos (por rol, por héroe...) entre
+  procesos y devuelve los resultados en el orden de los grupos
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+BASE_COLUMNS = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing',
+                'mvp', 'role', 'hero_id']
+
+
+class SharedColumns:
+    """Columnas en memoria compartida, descritas por un `spec` serializable."""
+
+    def __init__(self, spec, blocks, owner):
+        self.spec = spec
+        self._blocks = blocks
+        self._owner = owner
+        self.arrays = {
+            col: np.ndarray((length,), dtype=np.dtype(dtype), buffer=blocks[col].buf)
+            for col, (_, dtype, length, _, _) in spec.items()
+        }
+
+    @classmethod
+    def create(cls, df, columns):
+        spec, blocks = {}, {}
+        for col in columns:
+            series = df[col]
+            categories = None
+            if series.dtype == bool:
+                values = series.to_numpy().astype(np.int8)
+            elif pd.api.types.is_numeric_dtype(series.dtype):
+                values = series.to_numpy(np.float64)
+            else:
+                # Texto: códigos en memoria compartida (-1 = NaN), valores en el spec
+                values, categories = pd.factorize(series)
+                categories = np.append(np.asarray(categories, dtype=object), None)
+            shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+            spec[col] = (shm.name, values.dtype.str, len(values), series.dtype, categories)
+            blocks[col] = shm
+        return cls(spec, blocks, owner=True)
+
+    @classmethod
+    def attach(cls, spec):
+        blocks = {}
+        for col, (name, *_) in spec.items():
+            # Los workers son hijos del runner y comparten su resource_tracker:
+            # el registro del attach no duplica nada y el unlink lo hace el dueño
+            blocks[col] = shared_memory.SharedMemory(name=name)
+        return cls(spec, blocks, owner=False)
+
+    def frame(self, idx):
+        """
+        DataFrame con las filas `idx` (la única copia es la del propio grupo),
+        con el dtype y las posiciones originales como índice.
+        """
+        columns = {}
+        for col, arr in self.arrays.items():
+            _, _, _, dtype, categories = self.spec[col]
+            values = arr[idx] if categories is None else categories[arr[idx]]
+            columns[col] = pd.Series(values, dtype=dtype, index=idx)
+        return pd.DataFrame(columns, index=idx)
+
+    def close(self):
+        self.arrays = {}
+        for shm in self._blocks.values():
+            shm.close()
+            if self._owner:
+                shm.unlink()
+
+
+_worker_columns = None
+
+
+def _init_worker(spec):
+    global _worker_columns
+    _worker_columns = SharedColumns.attach(spec)
+
+
+def _run_group(args):
+    func, name, idx = args
+    return func(_worker_columns, idx, name)
+
+
+def run_parallel(df, groups, func, columns=None, workers=None):
+    """
+    `groups` es {nombre: array de posiciones}; `func(columnas, idx, nombre)`
+    corre en un worker y debe ser una función de módulo (serializable).
+    """
+    columns = columns or [c for c in BASE_COLUMNS if c in df.columns]
+    shared = SharedColumns.create(df, columns)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.spec,)) as ex:
+            tasks = [(func, name, np.asarray(idx, dtype=np.int64)) for name, idx in groups.items()]
+            return dict(zip(groups, ex.map(_run_group, tasks)))
+    finally:
+        shared.close()
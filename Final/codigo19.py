@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rating incremental por jugador, por jugador+héroe y por héroe.
+- Cada fila se compara con su rol mediante media/varianza acumuladas
+  (Welford): KDA, daño, daño recibido, curación y MVP pasan a z-scores
+- El compuesto ponderado se suaviza con una media exponencial (EWMA)
+- Cada fila nueva cuesta O(1); los rankings no vuelven a leer el histórico
+- Las filas ya incorporadas (match_uid + fila, codigo11.py) se saltan: volver
+  a pasar el mismo CSV no duplica partidas
+Uso: python codigo19.py [rivals_data.csv ...]
+"""
+
+import os
+import sys
+import json
+import heapq
+import math
+
+import pandas as pd
+
+from codigo11 import match_uid
+
+RATING_FILE = 'ratings.json'
+ALPHA = 0.1          # peso de la partida más reciente en la EWMA
+MIN_ROLE_ROWS = 30   # hasta entonces el rol no tiene varianza fiable
+
+WEIGHTS = {'kda': 0.30, 'damage': 0.25, 'dmg_taken': 0.10, 'healing': 0.20, 'mvp': 0.15}
+
+
+class RunningStats:
+    """Media y varianza de Welford: O(1) por valor, sin guardar el histórico."""
+
+    def __init__(self, n=0, mean=0.0, m2=0.0):
+        self.n, self.mean, self.m2 = n, mean, m2
+
+    def push(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def z(self, x):
+        std = self.std
+        return (x - self.mean) / std if std > 0 and self.n >= MIN_ROLE_ROWS else 0.0
+
+
+def _row_stats(row):
+    deaths = max(int(row['deaths']), 1)
+    return {
+        'kda': (int(row['kills']) + int(row['assists'])) / deaths,
+        'damage': float(row['damage']),
+        'dmg_taken': float(row['dmg_taken']),
+        'healing': float(row['healing']),
+        'mvp': 1.0 if str(row['mvp']).lower() == 'true' else 0.0,
+    }
+
+
+def _hero_key(value):
+    """hero_id llega como '1026001', 1026001 o 1026001.0 según la fuente."""
+    try:
+        return str(int(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _player_key(value):
+    """player_id llega como '209656717' o 209656717.0 (columna con NaN en el CSV)."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    try:
+        return str(int(float(value)))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class RatingEngine:
+    def __init__(self, alpha=ALPHA):
+        self.alpha = alpha
+        self.role_stats = {}   # rol -> {stat: RunningStats}
+        # clave -> [rating EWMA, partidas, tasa MVP EWMA]
+        self.tables = {'player': {}, 'player_hero': {}, 'hero': {}}
+        self.seen = set()      # 'match_uid|fila' ya incorporadas
+
+    def _bump(self, table, key, score, mvp):
+        entry = self.tables[table].get(key)
+        if entry is None:
+            self.tables[table][key] = [score, 1, mvp]
+        else:
+            entry[0] += self.alpha * (score - entry[0])
+            entry[1] += 1
+            entry[2] += self.alpha * (mvp - entry[2])
+
+    def update_row(self, row):
+        """Incorpora una fila (dict o Series del scraper/ingesta) en O(1)."""
+        stats = _row_stats(row)
+        role = int(row['role'])
+        role_stats = self.role_stats.setdefault(role, {k: RunningStats() for k in WEIGHTS})
+
+        # Primero se puntúa contra el rol tal como estaba, luego se actualiza
+        score = sum(w * role_stats[k].z(stats[k]) for k, w in WEIGHTS.items())
+        for k in WEIGHTS:
+            role_stats[k].push(stats[k])
+
+        hero = _hero_key(row.get('hero_id'))
+        player = _player_key(row.get('player_id'))
+        if hero is not None:
+            self._bump('hero', hero, score, stats['mvp'])
+        if player is not None:
+            self._bump('player', player, score, stats['mvp'])
+            if hero is not None:
+                self._bump('player_hero', f"{player}|{hero}", score, stats['mvp'])
+        return score
+
+    def update_rows(self, rows):
+        """Incorpora un lote (DataFrame o dicts) saltando las filas ya vistas."""
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if df.empty:
+            return 0
+        uids = df['match_uid'] if 'match_uid' in df.columns else match_uid(df)
+        keys = uids.astype(str) + '|' + df['row'].astype(str)
+        fresh = ~keys.isin(self.seen) & ~keys.duplicated()
+        for row in df[fresh.to_numpy()].to_dict('records'):
+            self.update_row(row)
+        self.seen.update(keys[fresh])
+        return int(fresh.sum())
+
+    def leaderboard(self, table='player', n=10, min_games=5):
+        """Top-n por rating; recorre las entidades, nunca las filas históricas."""
+        items = ((k, v) for k, v in self.tables[table].items() if v[1] >= min_games)
+        top = heapq.nlargest(n, items, key=lambda kv: kv[1][0])
+        return pd.DataFrame(
+            [(k, v[0], v[1], v[2]) for k, v in top],
+            columns=[table, 'rating', 'games', 'mvp_rate']
+        )
+
+    def save(self, path=RATING_FILE):
+        state = {
+            'alpha': self.alpha,
+            'role_stats': {
+                str(role): {k: [s.n, s.mean, s.m2] for k, s in stats.items()}
+                for role, stats in self.role_stats.items()
+            },
+            'tables': self.tables,
+            'seen': sorted(self.seen),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+    @classmethod
+    def load(cls, path=RATING_FILE):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        engine = cls(state['alpha'])
+        engine.role_stats = {
+            int(role): {k: RunningStats(*v) for k, v in stats.items()}
+            for role, stats in state['role_stats'].items()
+        }
+        engine.tables = state['tables']
+        engine.seen = set(state.get('seen', []))
+        return engine
+
+
+if __name__ == "__main__":
+    engine = RatingEngine.load()
+    for path in sys.argv[1:] or ['rivals_data.csv']:
+        data = pd.read_csv(path)
+        added = engine.update_rows(data)
+        print(f"[+] {added} filas nuevas de '{path}' incorporadas al rating "
+              f"({len(data) - added} ya vistas).")
+    engine.save()
+
+    names = pd.read_csv('marvel_hero_ids.csv', dtype={'hero_id': str})
+    board = engine.leaderboard('hero', n=10, min_games=20)
+    board = board.merge(names, left_on='hero', right_on='hero_id', how='left')
+    print("\n[►] Héroes con mejor rendimiento relativo a su rol:\n",
+          board[['hero_name', 'rating', 'games', 'mvp_rate']].to_string(index=False))
+    if engine.tables['player']:
+        print("\n[►] Ranking de jugadores:\n", engine.leaderboard('player').to_string(index=False))
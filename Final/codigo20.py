@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tendencias por ventana móvil por jugador/héroe (¿mejora su daño con Hela?).
+- Medias móviles, EWMA y marcas de cambio de nivel sobre el orden de las
+  partidas (columna `timestamp` si existe; si no, `match` del perfil, donde
+  match 1 es la más reciente)
+- Todo con operaciones rolling/ewm agrupadas, sin bucles por entidad
+- Estado en caché (últimas `window` filas y EWMA por entidad): añadir
+  partidas cuesta O(filas nuevas + ventana de cada entidad tocada), no
+  recalcular el histórico
+- Las filas ya procesadas (match_uid + fila, codigo11.py) se saltan: volver
+  a pasar el mismo CSV no duplica historia
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from codigo11 import match_uid
+
+STATE_FILE = 'trends_state.pkl'
+STATS = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing']
+
+
+def chronological(df):
+    """Ordena un lote de la partida más antigua a la más reciente."""
+    if 'timestamp' in df.columns:
+        return df.sort_values('timestamp', kind='mergesort')
+    return df.sort_values('match', ascending=False, kind='mergesort')
+
+
+class TrendTracker:
+    def __init__(self, keys=('player_id', 'hero_id'), stats=STATS, window=20, span=10,
+                 half=5, z=2.5):
+        self.keys = list(keys)
+        self.stats = list(stats)
+        self.window = window   # media móvil y desviación de referencia
+        self.span = span       # EWMA
+        self.half = half       # tramo reciente vs anterior para el cambio de nivel
+        self.z = z
+        self.tail = None       # últimas `window` filas por entidad
+        self.ewma = None       # último valor EWMA por entidad
+        self.seen = set()      # 'match_uid|fila' ya procesadas
+
+    def _grouped_rolling(self, frame, size, how):
+        rolled = getattr(frame.groupby(self.keys, sort=False)[self.stats]
+                         .rolling(size, min_periods=1), how)()
+        return rolled.reset_index(level=list(range(len(self.keys))), drop=True).reindex(frame.index)
+
+    def _touched(self, state, entities):
+        """Filas de `state` cuyas entidades aparecen en el lote nuevo."""
+        index = pd.MultiIndex.from_frame(state[self.keys])
+        return index.isin(pd.MultiIndex.from_frame(entities))
+
+    def append(self, new):
+        """
+        Procesa filas nuevas (más recientes que todo lo anterior) y devuelve sus
+        tendencias; las filas ya vistas en lotes anteriores no se repiten.
+        """
+        # El uid se calcula con el lote entero: los bloques de lobby son consecutivos
+        uids = new['match_uid'] if 'match_uid' in new.columns else match_uid(new)
+        row_keys = uids.astype(str) + '|' + new['row'].astype(str)
+        fresh = ~row_keys.isin(self.seen) & ~row_keys.duplicated() & new[self.keys].notna().all(axis=1)
+        new, row_keys = new[fresh.to_numpy()], row_keys[fresh]
+        if new.empty:
+            return new.assign(**{f"{s}_{kind}": pd.Series(dtype=dtype) for s in self.stats
+                                 for kind, dtype in (('roll', float), ('ewma', float), ('shift', bool))})
+        self.seen.update(row_keys)
+        new = chronological(new).reset_index(drop=True)
+        entities = new[self.keys].drop_duplicates()
+        base = new[self.keys + self.stats].assign(_new=True)
+
+        # Solo entran en el cálculo las colas de las entidades tocadas
+        tail, seeds = None, None
+        if self.tail is not None:
+            touched = self._touched(self.tail, entities)
+            tail, self.tail = self.tail[touched], self.tail[~touched]
+            touched = self._touched(self.ewma, entities)
+            seeds, self.ewma = self.ewma[touched], self.ewma[~touched]
+        work = base if tail is None else pd.concat([tail.assign(_new=False), base], ignore_index=True)
+        fresh = work['_new'].to_numpy()
+
+        roll = self._grouped_rolling(work, self.window, 'mean')
+        std = self._grouped_rolling(work, self.window, 'std')
+        recent = self._grouped_rolling(work, self.half, 'mean')
+        previous = recent.groupby([work[k] for k in self.keys], sort=False).shift(self.half)
+        shift = (recent - previous).abs() > self.z * std * np.sqrt(2 / self.half)
+
+        # EWMA continuada (adjust=False): la semilla es el último valor guardado
+        seeded = work.loc[fresh, self.keys + self.stats]
+        if seeds is not None and len(seeds):
+            seeds = seeds.copy()
+            seeds.index = -1 - np.arange(len(seeds))   # no chocan con los índices de `work`
+            seeded = pd.concat([seeds, seeded])
+        ewm = (seeded.groupby(self.keys, sort=False)[self.stats]
+               .ewm(span=self.span, adjust=False).mean()
+               .reset_index(level=list(range(len(self.keys))), drop=True))
+        ewm = ewm.loc[work.index[fresh]]
+
+        out = new.copy()
+        for s in self.stats:
+            out[f"{s}_roll"] = roll[s].to_numpy()[fresh]
+            out[f"{s}_ewma"] = ewm[s].to_numpy()
+            out[f"{s}_shift"] = shift[s].to_numpy()[fresh]
+
+        # Estado para el próximo lote
+        tail = work.groupby(self.keys, sort=False).tail(self.window)[self.keys + self.stats]
+        last = ewm.assign(**{k: work.loc[fresh, k].to_numpy() for k in self.keys})
+        last = last.groupby(self.keys, sort=False).tail(1)[self.keys + self.stats]
+        self.tail = tail if self.tail is None else pd.concat([self.tail, tail], ignore_index=True)
+        self.ewma = last if self.ewma is None else pd.concat([self.ewma, last], ignore_index=True)
+        return out
+
+    def save(self, path=STATE_FILE):
+        # Solo tablas y parámetros: un pickle del objeto quedaría ligado al
+        # módulo que lo creó (__main__.TrendTracker al lanzar este script)
+        pd.to_pickle({
+            'params': {'keys': self.keys, 'stats': self.stats, 'window': self.window,
+                       'span': self.span, 'half': self.half, 'z': self.z},
+            'tail': self.tail, 'ewma': self.ewma, 'seen': sorted(self.seen),
+        }, path)
+
+    @classmethod
+    def load(cls, path=STATE_FILE, **kwargs):
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        state = pd.read_pickle(path)
+        tracker = cls(**state['params'])
+        tracker.tail, tracker.ewma = state['tail'], state['ewma']
+        tracker.seen = set(state['seen'])
+        return tracker
+
+
+if __name__ == "__main__":
+    data = pd.read_csv(sys.argv[1] if len(sys.argv) > 1 else 'rivals_data5.csv')
+    # Los CSV antiguos no tienen player_id: tendencias por héroe del perfil
+    keys = ['player_id', 'hero_id'] if 'player_id' in data.columns else ['hero_id']
+    tracker = TrendTracker.load(keys=keys)
+    trends = tracker.append(data)
+    tracker.save()
+    flagged = trends[trends['damage_shift']]
+    print(f"[+] {len(trends)} filas nuevas procesadas; {len(flagged)} cambios de nivel en daño.")
+    print(trends[keys + ['match', 'damage', 'damage_roll', 'damage_ewma', 'damage_shift']].tail(10))
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Detección de anomalías en streaming mientras scrape_player emite filas.
+- Por héroe (o por rol mientras el héroe tiene pocas filas): media/varianza
+  de Welford y cuartiles robustos con el estimador P² (memoria constante)
+- Cada fila se puntúa en O(1) antes de actualizar las estadísticas
+- Marca líneas muy fuera de lo normal para el héroe (smurf/trampa) y
+  errores de parseo típicos, como daño y daño recibido intercambiados
+- Las alertas se añaden a un stream JSONL, sin pasadas batch por el dataset
+Uso: python codigo21.py [rivals_data.csv]   (re-emite un CSV como stream)
+"""
+
+import os
+import sys
+import json
+import time
+
+import pandas as pd
+
+from codigo19 import RunningStats, _hero_key
+
+ALERTS_FILE = 'alerts.jsonl'
+STATE_FILE = 'anomaly_state.json'
+STATS = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing']
+MIN_ROWS = 30        # filas antes de confiar en las estadísticas de un grupo
+# Límite por estadística; una fila se marca si |z| de Welford Y |z| robusto
+# (mediana e IQR) lo superan. Las kills son la señal de smurf/trampa; daño,
+# asistencias, etc. dependen sobre todo de la duración de la partida
+LIMITS = {'kills': 3.0, 'damage': 4.0, 'deaths': 4.5, 'assists': 4.5,
+          'dmg_taken': 4.5, 'healing': 4.5}
+# Estadística ajena al héroe (curación de un Duelist): mediana ~0 frente a su
+# dispersión; cualquier curación puntual daría un z enorme, así que se ignora
+ZERO_MEDIAN = 0.01   # mediana < ZERO_MEDIAN * desviación
+SWAP_GAIN = 4.0      # mejora mínima de la puntuación al deshacer el intercambio
+
+
+class P2Quantile:
+    """Estimador P² de Jain y Chlamtac: un cuantil con 5 marcadores, O(1) por valor."""
+
+    def __init__(self, p, state=None):
+        self.p = p
+        if state:
+            self.q, self.n, self.np_, self.init = state
+        else:
+            self.q, self.n, self.np_, self.init = [], [0, 1, 2, 3, 4], None, []
+
+    def push(self, x):
+        if len(self.init) < 5:
+            self.init.append(x)
+            if len(self.init) == 5:
+                self.q = sorted(self.init)
+                p = self.p
+                self.np_ = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+            return
+        q, n = self.q, self.n
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        p = self.p
+        for i, dn in enumerate([0, p / 2, p, (1 + p) / 2, 1]):
+            self.np_[i] += dn
+        for i in (1, 2, 3):
+            d = self.np_[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp
+                n[i] += d
+
+    @property
+    def value(self):
+        if len(self.init) < 5:
+            return sorted(self.init)[len(self.init) // 2] if self.init else 0.0
+        return self.q[2]
+
+    def state(self):
+        return [self.q, self.n, self.np_, self.init]
+
+
+class _StatTracker:
+    """Welford + cuartiles 25/50/75 de una estadística."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.moments = RunningStats(*state.get('moments', []))
+        self.quartiles = [P2Quantile(p, state.get(str(p))) for p in (0.25, 0.5, 0.75)]
+
+    def push(self, x):
+        self.moments.push(x)
+        for q in self.quartiles:
+            q.push(x)
+
+    def is_zero_inflated(self):
+        return self.quartiles[1].value < ZERO_MEDIAN * self.moments.std
+
+    def scores(self, x):
+        std = self.moments.std
+        z = (x - self.moments.mean) / std if std > 0 else 0.0
+        q1, med, q3 = (q.value for q in self.quartiles)
+        # Suelo de media desviación: estadísticas casi siempre a 0 (curación de
+        # un Duelist) tienen IQR nulo y cualquier valor daría un z infinito
+        scale = max((q3 - q1) / 1.349, 0.5 * std) or 1.0
+        return z, (x - med) / scale
+
+    def state(self):
+        m = self.moments
+        out = {'moments': [m.n, m.mean, m.m2]}
+        out.update({str(q.p): q.state() for q in self.quartiles})
+        return out
+
+
+class AnomalyDetector:
+    def __init__(self, alerts_path=ALERTS_FILE, limits=None):
+        self.alerts_path = alerts_path
+        self.limits = dict(LIMITS, **(limits or {}))
+        self.groups = {}   # 'hero:<id>' o 'role:<n>' -> {stat: _StatTracker}
+        self.flagged = 0
+
+    def _group(self, key):
+        if key not in self.groups:
+            self.groups[key] = {s: _StatTracker() for s in STATS}
+        return self.groups[key]
+
+    @staticmethod
+    def _score(trackers, values):
+        return {s: trackers[s].scores(values[s]) for s in STATS}
+
+    def observe(self, row):
+        """Puntúa una fila en O(1), actualiza estadísticas y devuelve la alerta (o None)."""
+        values = {s: float(row[s]) for s in STATS}
+        # '1026001' (scraper) y 1026001.0 (CSV) son el mismo héroe
+        hero = self._group(f"hero:{_hero_key(row.get('hero_id'))}")
+        role = self._group(f"role:{row.get('role')}")
+        trackers = hero if hero['kills'].moments.n >= MIN_ROWS else role
+
+        alert = None
+        if trackers['kills'].moments.n >= MIN_ROWS:
+            scores = self._score(trackers, values)
+            reasons = [
+                f"{s}={values[s]:.0f} (z={z:.1f}, robusto={rz:.1f})"
+                for s, (z, rz) in scores.items()
+                if abs(z) > self.limits[s] and abs(rz) > self.limits[s]
+                and not trackers[s].is_zero_inflated()
+            ]
+            # ¿Daño y daño recibido intercambiados por el parser?
+            swapped = dict(values, damage=values['dmg_taken'], dmg_taken=values['damage'])
+            now = sum(abs(rz) for s in ('damage', 'dmg_taken') for rz in [scores[s][1]])
+            alt = sum(abs(trackers[s].scores(swapped[s])[1]) for s in ('damage', 'dmg_taken'))
+            if now > self.limits['damage'] and now - alt > SWAP_GAIN:
+                reasons.append("posible damage/dmg_taken intercambiados")
+            if reasons:
+                alert = {
+                    'ts': time.time(),
+                    'match': row.get('match'), 'row': row.get('row'),
+                    'hero_id': row.get('hero_id'), 'hero_name': row.get('hero_name'),
+                    'player_id': row.get('player_id'),
+                    'baseline': 'hero' if trackers is hero else 'role',
+                    'reasons': reasons,
+                }
+                self._emit(alert)
+
+        for trackers in (hero, role):
+            for s in STATS:
+                trackers[s].push(values[s])
+        return alert
+
+    def _emit(self, alert):
+        self.flagged += 1
+        with open(self.alerts_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(alert, default=str) + "\n")
+        print(f"      ⚠ Anomalía ({alert['hero_name']}, partida {alert['match']}): "
+              f"{'; '.join(alert['reasons'])}")
+
+    def save(self, path=STATE_FILE):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({k: {s: t.state() for s, t in g.items()} for k, g in self.groups.items()}, f)
+
+    @classmethod
+    def load(cls, path=STATE_FILE, alerts_path=ALERTS_FILE, limits=None):
+        detector = cls(alerts_path, limits)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            detector.groups = {k: {s: _StatTracker(t) for s, t in g.items()} for k, g in state.items()}
+        return detector
+
+
+if __name__ == "__main__":
+    detector = AnomalyDetector.load()
+    data = pd.read_csv(sys.argv[1] if len(sys.argv) > 1 else 'rivals_data.csv')
+    data = data.dropna(subset=STATS)
+    start = time.perf_counter()
+    for row in data.to_dict('records'):
+        detector.observe(row)
+    elapsed = time.perf_counter() - start
+    detector.save()
+    print(f"\n[+] {len(data)} filas en {elapsed:.2f} s "
+          f"({1e6 * elapsed / len(data):.0f} µs/fila); {detector.flagged} alertas en '{ALERTS_FILE}'.")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Percentiles de cada fila frente a la distribución de su héroe y de su rol
+("este daño es el percentil 93 de Hela, esta curación el 40 de Strategist").
+- Referencia precalculada: por estadística, un único array ordenado con los
+  valores de todos los grupos concatenados (clave = grupo * ancho + valor)
+- El anotador hace un searchsorted por columna entera, sin bucles por héroe
+- La referencia se guarda en disco y se regenera cuando el dataset cambia
+Uso: python codigo22.py [rivals_data.csv]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+REFERENCE_FILE = 'percentiles.npz'
+DATA_FILE = 'rivals_data.csv'
+STATS = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing']
+MIN_ROWS = 20   # un héroe con menos filas no tiene distribución propia
+
+
+class PercentileReference:
+    def __init__(self, groups):
+        # groups: 'hero'/'role' -> {'ids', 'start', 'count', 'low', 'width', stat: claves}
+        self.groups = groups
+
+    @classmethod
+    def build(cls, df, min_rows=MIN_ROWS):
+        df = df.dropna(subset=STATS)
+        groups = {}
+        for level, col, minimum in (('hero', 'hero_id', min_rows), ('role', 'role', 1)):
+            ids = pd.to_numeric(df[col], errors='coerce')
+            keep = ids.notna().to_numpy()
+            codes, counts = np.unique(ids[keep].to_numpy(np.int64), return_counts=True)
+            codes = codes[counts >= minimum]
+            code_idx = np.searchsorted(codes, ids[keep].to_numpy(np.int64))
+            code_idx = np.minimum(code_idx, max(len(codes) - 1, 0))
+            member = np.zeros(keep.sum(), dtype=bool)
+            if len(codes):
+                member = codes[code_idx] == ids[keep].to_numpy(np.int64)
+            group = code_idx[member]
+            entry = {'ids': codes, 'count': np.bincount(group, minlength=len(codes))}
+            entry['start'] = np.r_[0, np.cumsum(entry['count'])[:-1]]
+            for s in STATS:
+                values = df[s].to_numpy(np.float64)[keep][member]
+                low = values.min() if len(values) else 0.0
+                # Ancho con un hueco por cada lado: lo que cae fuera del rango
+                # de referencia se recorta sin invadir el grupo vecino
+                width = (values.max() - low + 3) if len(values) else 3.0
+                entry[f"{s}_low"], entry[f"{s}_width"] = low, width
+                entry[s] = np.sort(group * width + (values - low + 1))
+            groups[level] = entry
+        return cls(groups)
+
+    def annotate(self, df, stats=STATS):
+        """Añade `<stat>_pct_hero` y `<stat>_pct_role` (0-100, NaN sin referencia)."""
+        out = df.copy()
+        for level, col in (('hero', 'hero_id'), ('role', 'role')):
+            entry = self.groups[level]
+            codes = entry['ids']
+            ids = pd.to_numeric(df[col], errors='coerce').to_numpy(np.float64)
+            known = ~np.isnan(ids)
+            pos = np.zeros(len(df), dtype=np.int64)
+            if len(codes):
+                pos[known] = np.minimum(np.searchsorted(codes, ids[known].astype(np.int64)),
+                                        len(codes) - 1)
+                known &= codes[pos] == np.nan_to_num(ids).astype(np.int64)
+            else:
+                known[:] = False
+            start, count = entry['start'][pos], entry['count'][pos]
+            for s in stats:
+                low, width = entry[f"{s}_low"], entry[f"{s}_width"]
+                values = pd.to_numeric(df[s], errors='coerce').to_numpy(np.float64)
+                keys = pos * width + np.clip(values - low + 1, 0, width - 1)
+                # Las estadísticas son enteros con pocos valores distintos: se
+                # busca cada clave única una vez, con las consultas ya ordenadas
+                uniq, inverse = np.unique(keys, return_inverse=True)
+                # Rango percentil "medio": empates cuentan la mitad
+                below = np.searchsorted(entry[s], uniq, 'left')[inverse] - start
+                upto = np.searchsorted(entry[s], uniq, 'right')[inverse] - start
+                pct = 100.0 * (below + upto) / (2 * np.maximum(count, 1))
+                pct[~known | np.isnan(values)] = np.nan
+                out[f"{s}_pct_{level}"] = pct
+        return out
+
+    def save(self, path=REFERENCE_FILE):
+        np.savez(path, **{f"{level}.{k}": v for level, entry in self.groups.items()
+                          for k, v in entry.items()})
+
+    @classmethod
+    def load(cls, path=REFERENCE_FILE):
+        groups = {}
+        with np.load(path) as data:
+            for name in data.files:
+                level, key = name.split('.', 1)
+                value = data[name]
+                groups.setdefault(level, {})[key] = value if value.ndim else value.item()
+        return cls(groups)
+
+
+def get_reference(data_path=DATA_FILE, path=REFERENCE_FILE):
+    """
+    Referencia guardada; se regenera si el dataset es más reciente que ella.
+    None si no hay ni referencia ni dataset (primera captura).
+    """
+    if os.path.exists(path) and (
+        not os.path.exists(data_path) or os.path.getmtime(path) >= os.path.getmtime(data_path)
+    ):
+        return PercentileReference.load(path)
+    if not os.path.exists(data_path):
+        print(f"[!] Sin '{data_path}': no hay referencia de percentiles todavía.")
+        return None
+    print(f"[*] Regenerando referencia de percentiles desde '{data_path}'...")
+    reference = PercentileReference.build(pd.read_csv(data_path))
+    reference.save(path)
+    return reference
+
+
+def annotate_percentiles(df, data_path=DATA_FILE):
+    """Filas con sus percentiles; sin referencia se devuelven tal cual."""
+    reference = get_reference(data_path)
+    return reference.annotate(df) if reference is not None else df
+
+
+if __name__ == "__main__":
+    data_path = sys.argv[1] if len(sys.argv) > 1 else DATA_FILE
+    data = pd.read_csv(data_path)
+    reference = get_reference(data_path)
+
+    big = pd.concat([data] * max(1, 2_000_000 // len(data)), ignore_index=True)
+    start = time.perf_counter()
+    annotated = reference.annotate(big)
+    elapsed = time.perf_counter() - start
+    print(f"[+] {len(big)} filas anotadas en {elapsed:.2f} s.")
+    cols = ['hero_name', 'damage', 'damage_pct_hero', 'healing', 'healing_pct_role']
+    print(annotated[[c for c in cols if c in annotated.columns]].head(10).to_string(index=False))
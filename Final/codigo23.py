@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Informe HTML estático del análisis (sustituye a las ventanas de plt.show()).
+- Una sección por rol (estadísticas, coeficientes, métricas, ROC y
+  calibración) y una por héroe (estadísticas, tasa de MVP, distribuciones)
+- Backend Agg: funciona sin pantalla; las figuras se dibujan en paralelo
+- Cada sección guarda la huella de sus datos y del modelo; al regenerar solo
+  se reconstruyen (y se vuelven a ajustar) las secciones cuya huella cambió
+Uso: python codigo23.py [rivals_data.csv]   ->   report/index.html
+"""
+
+import os
+import sys
+import html
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from codigo6 import ROLE_MAP, load_dataset, fit_roles
+from codigo8 import PARAM_GRID
+from codigo24 import profiler, worker_init
+
+REPORT_DIR = 'report'
+MANIFEST = 'manifest.json'
+# Subir al cambiar el formato de las secciones: invalida todas las huellas
+REPORT_VERSION = 1
+STATS = ['kills', 'deaths', 'assists', 'damage', 'dmg_taken', 'healing']
+
+PAGE = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Rivals Web Tracker - Informe</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }}
+table {{ border-collapse: collapse; margin: .5em 0 1em; font-size: .85em; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 8px; text-align: right; }}
+section {{ border-top: 2px solid #444; margin-top: 2em; }}
+img {{ max-width: 48%; }}
+code {{ font-size: .8em; }}
+</style></head><body>
+<h1>Rivals Web Tracker</h1>
+<p>Generado el {date}: {rows} filas, {n_sections} secciones.</p>
+<ul>{toc}</ul>
+{body}
+</body></html>
+"""
+
+
+def _fingerprint(frame, *extra):
+    """Huella de las filas de una sección (+ parámetros del modelo y versión)."""
+    digest = hashlib.sha256(repr((REPORT_VERSION,) + extra).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _table(df, digits=3):
+    return df.to_html(float_format=lambda v: f"{v:.{digits}f}", border=0)
+
+
+def _plan_sections(df):
+    """[(clave, título, tipo, posiciones, huella)] en el orden del informe."""
+    sections = []
+    roles = df['role'].to_numpy()
+    for code, name in ROLE_MAP.items():
+        idx = np.flatnonzero(roles == code)
+        if len(idx):
+            sections.append((f"rol-{name}", f"Rol: {name}", 'role', idx,
+                             _fingerprint(df.iloc[idx], repr(PARAM_GRID))))
+        else:
+            print(f"\n--- No hay datos para rol: {name} ---")
+
+    hero_ids = pd.to_numeric(df['hero_id'], errors='coerce').astype('Int64')
+    names = df['hero_name'] if 'hero_name' in df.columns else hero_ids.astype(str)
+    heroes = pd.DataFrame({'hero_id': hero_ids, 'name': names}).dropna(subset=['hero_id'])
+    for hero_id, group in sorted(heroes.groupby('hero_id'), key=lambda kv: kv[1]['name'].iloc[0]):
+        idx = group.index.to_numpy()
+        sections.append((f"heroe-{hero_id}", f"Héroe: {group['name'].iloc[0]}", 'hero', idx,
+                         _fingerprint(df.loc[idx, STATS + ['mvp']])))
+    return sections
+
+
+def _role_section(key, title, result, fig_dir):
+    total, unique, dups = result['rows']
+    metrics, ci = result['metrics'], result['ci']
+    scores = pd.DataFrame(
+        [(metrics[k], *ci[k]) for k in ci], index=list(ci), columns=['valor', 'IC 2.5%', 'IC 97.5%']
+    )
+    coefs = pd.DataFrame({'coeficiente': result['coefs']}, index=result['features'])
+    coefs = coefs.reindex(coefs['coeficiente'].abs().sort_values(ascending=False).index)
+    parts = [
+        f"<p>{total} filas ({unique} únicas, {dups} duplicadas).</p>",
+        "<h3>Estadísticas descriptivas</h3>", _table(result['stats'], 1),
+        "<h3>Correlaciones</h3>", _table(result['corr']),
+    ]
+    if result['pct'] is not None:
+        parts += ["<h3>Percentil mediano frente a su héroe (MVP vs resto)</h3>",
+                  _table(result['pct'], 1)]
+    parts += [
+        "<h3>Métricas (IC 95% bootstrap)</h3>", _table(scores),
+        f"<h3>Coeficientes</h3><p>Intercepto: {result['intercept']:.3f}</p>", _table(coefs),
+        f"<p><code>{html.escape(result['equation'])}</code></p>",
+        f'<img src="fig/{key}-roc.png"> <img src="fig/{key}-cal.png">',
+    ]
+    jobs = [
+        ('roc', os.path.join(fig_dir, f"{key}-roc.png"), title,
+         (metrics['fpr'], metrics['tpr'], metrics['roc_auc'])),
+        ('calibration', os.path.join(fig_dir, f"{key}-cal.png"), title,
+         (metrics['prob_pred'], metrics['prob_true'])),
+    ]
+    return parts, jobs
+
+
+def _hero_section(key, title, rows, fig_dir):
+    mvp = rows['mvp'].astype(bool)
+    stats = rows[STATS].describe().T
+    stats['median'] = rows[STATS].median()
+    by_mvp = rows.groupby(mvp)[STATS].mean().T.rename(columns={False: 'resto', True: 'MVP'})
+    parts = [
+        f"<p>{len(rows)} filas; tasa de MVP {mvp.mean():.1%}.</p>",
+        "<h3>Estadísticas descriptivas</h3>", _table(stats, 1),
+        "<h3>Media MVP vs resto</h3>", _table(by_mvp, 1),
+        f'<img src="fig/{key}.png">',
+    ]
+    payload = {s: (rows.loc[~mvp, s].to_numpy(), rows.loc[mvp, s].to_numpy())
+               for s in ('kills', 'damage')}
+    return parts, [('hero', os.path.join(fig_dir, f"{key}.png"), title, payload)]
+
+
+def _render(job):
+    """Worker: dibuja una figura con Agg y la guarda en disco."""
+    kind, path, title, data = job
+    if kind == 'hero':
+        fig, axes = plt.subplots(1, 2, figsize=(9, 3.2))
+        for ax, (stat, (rest, mvp)) in zip(axes, data.items()):
+            ax.hist([rest, mvp], bins=20, stacked=True, label=['Resto', 'MVP'])
+            ax.set_xlabel(stat)
+            ax.legend()
+        fig.suptitle(title)
+    else:
+        fig, ax = plt.subplots(figsize=(5, 4))
+        if kind == 'roc':
+            fpr, tpr, auc = data
+            ax.plot(fpr, tpr, label=f'ROC (AUC={auc:.2f})')
+            ax.plot([0, 1], [0, 1], '--', label='Aleatorio')
+            ax.set_title(f'Curva ROC - {title}')
+            ax.set_xlabel('FPR'); ax.set_ylabel('TPR')
+        else:
+            prob_pred, prob_true = data
+            ax.plot(prob_pred, prob_true, marker='o', label='Calibración')
+            ax.plot([0, 1], [0, 1], '--', label='Perfecta')
+            ax.set_title(f'Curva de Calibración - {title}')
+            ax.set_xlabel('Prob. predicha'); ax.set_ylabel('Prob. observada')
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=90)
+    plt.close(fig)
+    return path
+
+
+def build_report(df, fit=None, out_dir=REPORT_DIR, workers=None, force=False):
+    """
+    Genera `out_dir/index.html`. `fit({rol: posiciones})` devuelve los
+    resultados de analyze_role de los roles a reconstruir (por defecto en serie).
+    force=True reconstruye todas las secciones aunque su huella no cambie.
+    """
+    start = time.perf_counter()
+    fig_dir = os.path.join(out_dir, 'fig')
+    part_dir = os.path.join(out_dir, 'sections')
+    os.makedirs(fig_dir, exist_ok=True)
+    os.makedirs(part_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    with profiler.stage('report_plan'):
+        sections = _plan_sections(df)
+    stale = [s for s in sections
+             if force or manifest.get(s[0]) != s[4] or not os.path.exists(os.path.join(part_dir, f"{s[0]}.html"))]
+
+    # Solo los roles con huella nueva vuelven a pasar por el modelo
+    fit = fit or (lambda groups: fit_roles(df, groups))
+    role_groups = {title.split(': ', 1)[1]: idx for _, title, kind, idx, _ in stale if kind == 'role'}
+    with profiler.stage('fit_roles'):
+        results = fit(role_groups) if role_groups else {}
+
+    jobs, fragments = [], {}
+    with profiler.stage('report_sections'):
+        for key, title, kind, idx, _ in stale:
+            if kind == 'role':
+                parts, figs = _role_section(key, title, results[title.split(': ', 1)[1]], fig_dir)
+            else:
+                parts, figs = _hero_section(key, title, df.iloc[idx], fig_dir)
+            fragments[key] = f'<section id="{key}"><h2>{html.escape(title)}</h2>\n' + "\n".join(parts) + "</section>\n"
+            jobs += figs
+
+    with profiler.stage('render_figures'):
+        if len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=worker_init) as ex:
+                list(ex.map(_render, jobs, chunksize=4))
+        else:
+            for job in jobs:
+                _render(job)
+
+    # El manifiesto se actualiza solo cuando fragmentos y figuras están en disco
+    for key, fragment in fragments.items():
+        with open(os.path.join(part_dir, f"{key}.html"), 'w', encoding='utf-8') as f:
+            f.write(fragment)
+    manifest = {s[0]: s[4] for s in sections}
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+
+    body = []
+    for key, _, _, _, _ in sections:
+        with open(os.path.join(part_dir, f"{key}.html"), encoding='utf-8') as f:
+            body.append(f.read())
+    toc = "".join(f'<li><a href="#{key}">{html.escape(title)}</a></li>' for key, title, *_ in sections)
+    page = PAGE.format(date=time.strftime('%Y-%m-%d %H:%M'), rows=len(df),
+                       n_sections=len(sections), toc=toc, body="\n".join(body))
+    index = os.path.join(out_dir, 'index.html')
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write(page)
+
+    print(f"\n[+] Informe en '{index}': {len(stale)} secciones reconstruidas, "
+          f"{len(sections) - len(stale)} sin cambios ({time.perf_counter() - start:.1f} s).")
+    return index
+
+
+if __name__ == "__main__":
+    build_report(load_dataset(sys.argv[1] if len(sys.argv) > 1 else 'rivals_data.csv'))
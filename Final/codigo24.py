@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfilado por etapas del pipeline de análisis (python codigo6.py --profile).
+- Cada etapa mide tiempo de reloj, tiempo de CPU del proceso y pico de
+  memoria de tracemalloc (lo que la etapa añade sobre lo ya reservado)
+- Las etapas se anidan (main / analyze_role[Duelist] / corr ...) y el pico de
+  una etapa incluye el de sus hijas
+- Opcional: un volcado cProfile por etapa con su tiempo exclusivo
+  (.prof, legible con pstats o snakeviz)
+- Tabla resumen + traza JSON estable para comparar ejecuciones:
+    python codigo24.py diff antes.json despues.json
+Nota: el CPU de los workers (joblib, ProcessPoolExecutor) no cuenta en el del
+proceso; con --profile el análisis por rol corre en serie, sin la caché de
+modelos (codigo8) y reconstruyendo todo el informe (codigo23).
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import platform
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+TRACE_FILE = 'profile_trace.json'
+DUMP_DIR = 'profile'
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.dump_dir = None
+        self.records = []
+        self._started = 0
+        self._stack = []   # [ruta, pico acumulado, memoria al entrar, cProfile]
+
+    def enable(self, dump_dir=None):
+        self.enabled = True
+        self.dump_dir = dump_dir
+        if dump_dir:
+            os.makedirs(dump_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, note=None):
+        """Mide el bloque; sin enable() no hace nada (coste casi nulo). `note` va a la traza."""
+        if not self.enabled:
+            yield
+            return
+        parent = self._stack[-1] if self._stack else None
+        path = f"{parent[0]}/{name}" if parent else name
+        current, peak = tracemalloc.get_traced_memory()
+        if parent:
+            # El pico que lleva el padre se guarda antes de reiniciar el contador
+            parent[1] = max(parent[1], peak)
+            if parent[3]:
+                parent[3].disable()
+        tracemalloc.reset_peak()
+        prof = cProfile.Profile() if self.dump_dir else None
+        entry = [path, current, current, prof]
+        self._stack.append(entry)
+        start = self._started
+        self._started += 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        if prof:
+            prof.enable()
+        try:
+            yield
+        finally:
+            if prof:
+                prof.disable()
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self._stack.pop()
+            peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+            dump = None
+            if prof:
+                dump = os.path.join(self.dump_dir, f"{start:03d}_{_safe(path)}.prof")
+                prof.dump_stats(dump)
+            self.records.append({
+                'stage': path, 'depth': path.count('/'), 'start': start,
+                'wall_s': round(wall, 4), 'cpu_s': round(cpu, 4),
+                'peak_mb': round((peak - entry[2]) / 2**20, 2),
+                'dump': dump, 'note': note,
+            })
+            if parent:
+                parent[1] = max(parent[1], peak)
+                tracemalloc.reset_peak()
+                if parent[3]:
+                    parent[3].enable()
+
+    def summary(self):
+        """Etapas en orden de comienzo, sangradas según su anidamiento."""
+        if not self.records:
+            return pd.DataFrame(columns=['stage', 'wall_s', 'cpu_s', 'peak_mb', 'note'])
+        table = pd.DataFrame(self.records).sort_values('start')
+        table['stage'] = ['  ' * d + p.rsplit('/', 1)[-1] for d, p in zip(table['depth'], table['stage'])]
+        table['note'] = table['note'].fillna('')
+        return table[['stage', 'wall_s', 'cpu_s', 'peak_mb', 'note']]
+
+    def write_trace(self, path=TRACE_FILE, **meta):
+        trace = {
+            'meta': {'argv': sys.argv, 'python': platform.python_version(),
+                     'time': time.strftime('%Y-%m-%d %H:%M:%S'), **meta},
+            'stages': self.records,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=1, default=str)
+        return path
+
+    def report(self, path=TRACE_FILE, **meta):
+        if not self.enabled:
+            return
+        print("\n[►] Perfil por etapa (pico = memoria añadida por la etapa):")
+        print(self.summary().to_string(index=False))
+        print(f"[+] Traza en '{self.write_trace(path, **meta)}'"
+              + (f"; volcados cProfile en '{self.dump_dir}/'." if self.dump_dir else "."))
+
+
+def worker_init():
+    """Initializer de pools: los hijos de fork heredarían tracemalloc y cProfile."""
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    sys.setprofile(None)
+
+
+def _safe(path):
+    return "".join(c if c.isalnum() or c in '-_' else '_' for c in path)
+
+
+def diff(before, after):
+    """Compara dos trazas etapa a etapa (tiempo y pico de memoria)."""
+    frames = []
+    for path in (before, after):
+        with open(path, encoding='utf-8') as f:
+            stages = pd.DataFrame(json.load(f)['stages'])
+        frames.append(stages.groupby('stage', sort=False)[['wall_s', 'cpu_s', 'peak_mb']].sum())
+    table = frames[0].join(frames[1], how='outer', lsuffix='_antes', rsuffix='_despues')
+    table['wall_x'] = table['wall_s_despues'] / table['wall_s_antes']
+    table['peak_x'] = table['peak_mb_despues'] / table['peak_mb_antes']
+    return table
+
+
+# Instancia del proceso: codigo6 la usa siempre y solo mide tras enable()
+profiler = Profiler()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == 'diff':
+        with pd.option_context('display.width', 200, 'display.max_columns', None):
+            print(diff(sys.argv[2], sys.argv[3]).round(3).to_string())
+    else:
+        print("Uso: python codigo24.py diff antes.json despues.json")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registro de héroes y roles, sin dependencias: lo comparten el scraper
+(codigo3.py) y el validador (codigo13.py) sin que el análisis tenga que
+importar selenium ni el pool de navegadores.
+"""
+
+# Diccionario de héroes
+HERO_MAP = {
+    "1015001": "Storm", "1023001": "Rocket Raccoon", "1040001": "Mister Fantastic",
+    "1011001": "Hulk", "1034001": "Iron Man", "1022001": "Captain America",
+    "1029001": "Magik", "1042001": "Peni Parker", "1020001": "Mantis",
+    "1039001": "Thor", "1016001": "Loki", "1052001": "Iron Fist",
+    "1017001": "Human Torch", "1053001": "Emma Frost", "1027001": "Groot",
+    "1046001": "Adam Warlock", "1018001": "Doctor Strange", "1024001": "Hela",
+    "1036001": "Spider Man", "1051001": "The Thing", "1038001": "Scarlet Witch",
+    "1048001": "Psylocke", "1035001": "Venom", "1045001": "Namor",
+    "1025001": "Cloak & Dagger", "1026001": "Black Panther", "1043001": "Star Lord",
+    "1050001": "Invisible Woman", "1021001": "Hawkeye", "1049001": "Wolverine",
+    "1037001": "Magneto", "1014001": "The Punisher", "1030001": "Moon Knight",
+    "1032001": "Squirrel Girl", "1031001": "Luna Snow", "1041001": "Winter Soldier",
+    "1047001": "Jeff The Land Shark", "1033001": "Black Widow"
+}
+
+# Asignación de rol (1=Vanguard, 2=Duelist, 3=Strategist)
+HERO_ROLE_MAP = {
+    "1018001": 1, "1011001": 1, "1034001": 2, "1036001": 2,
+    "1031001": 3, "1045001": 2, "1016001": 3, "1026001": 2,
+    "1029001": 2, "1023001": 3, "1027001": 1, "1042001": 1,
+    "1015001": 2, "1037001": 1, "1043001": 2, "1020001": 3,
+    "1014001": 2, "1038001": 2, "1024001": 2, "1035001": 1,
+    "1046001": 3, "1047001": 3, "1039001": 1, "1041001": 2,
+    "1022001": 1, "1048001": 2, "1030001": 2, "1021001": 2,
+    "1032001": 2, "1052001": 2, "1033001": 2, "1025001": 3,
+    "1049001": 2, "1040001": 2, "1050001": 3, "1017001": 2,
+    "1051001": 1, "1053001": 1
+}
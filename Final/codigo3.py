@@ -5,67 +5,160 @@ Scraper rápido de Marvel Rivals:
 - Delay inicial de 10 s
 - Extrae K/D/A, daño, curación, MVP, héroe y rol
 - Perfil objetivo: player/1639942319
+- Reutiliza navegadores calientes del pool de codigo9.py
+- Expande varias partidas por adelantado y parsea el HTML localmente
+- Valida cada lote (codigo13.py); filas erróneas a cuarentena, no se pierden
+- Archiva el HTML expandido (codigo15.py) para re-parsear offline
+- Salta lobbies ya capturados desde otro perfil (codigo16.py)
 """
 
+import os
 import time
 import csv
-import undetected_chromedriver as uc
+import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-
-# Diccionario de héroes
-HERO_MAP = {
-    "1015001": "Storm", "1023001": "Rocket Raccoon", "1040001": "Mister Fantastic",
-    "1011001": "Hulk", "1034001": "Iron Man", "1022001": "Captain America",
-    "1029001": "Magik", "1042001": "Peni Parker", "1020001": "Mantis",
-    "1039001": "Thor", "1016001": "Loki", "1052001": "Iron Fist",
-    "1017001": "Human Torch", "1053001": "Emma Frost", "1027001": "Groot",
-    "1046001": "Adam Warlock", "1018001": "Doctor Strange", "1024001": "Hela",
-    "1036001": "Spider Man", "1051001": "The Thing", "1038001": "Scarlet Witch",
-    "1048001": "Psylocke", "1035001": "Venom", "1045001": "Namor",
-    "1025001": "Cloak & Dagger", "1026001": "Black Panther", "1043001": "Star Lord",
-    "1050001": "Invisible Woman", "1021001": "Hawkeye", "1049001": "Wolverine",
-    "1037001": "Magneto", "1014001": "The Punisher", "1030001": "Moon Knight",
-    "1032001": "Squirrel Girl", "1031001": "Luna Snow", "1041001": "Winter Soldier",
-    "1047001": "Jeff The Land Shark", "1033001": "Black Widow"
-}
+from bs4 import BeautifulSoup
 
-# Asignación de rol (1=Vanguard, 2=Duelist, 3=Strategist)
-HERO_ROLE_MAP = {
-    "1018001": 1, "1011001": 1, "1034001": 2, "1036001": 2,
-    "1031001": 3, "1045001": 2, "1016001": 3, "1026001": 2,
-    "1029001": 2, "1023001": 3, "1027001": 1, "1042001": 1,
-    "1015001": 2, "1037001": 1, "1043001": 2, "1020001": 3,
-    "1014001": 2, "1038001": 2, "1024001": 2, "1035001": 1,
-    "1046001": 3, "1047001": 3, "1039001": 1, "1041001": 2,
-    "1022001": 1, "1048001": 2, "1030001": 2, "1021001": 2,
-    "1032001": 2, "1052001": 2, "1033001": 2, "1025001": 3,
-    "1049001": 2, "1040001": 2, "1050001": 3, "1017001": 2,
-    "1051001": 1, "1053001": 1
-}
+from codigo9 import get_pool
+from codigo16 import SeenMatches, match_key, MATCH_KEYS_JS
+from codigo22 import annotate_percentiles
+from codigo13 import validate_and_quarantine, write_quarantine
+from codigo25 import HERO_MAP, HERO_ROLE_MAP
 
-def save_to_csv(data, filename='rivals_data.csv'):
+
+def save_to_csv(data, filename='rivals_data.csv', append=False):
     if not data:
         print("[!] No hay datos para guardar.")
         return
-    keys = data[0].keys()
+    keys = list(data[0].keys())
+    if append and os.path.exists(filename) and os.path.getsize(filename):
+        with open(filename, newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        if header != keys:
+            # Columnas distintas (p. ej. percentiles): se reescribe con la unión
+            old = pd.read_csv(filename)
+            pd.concat([old, pd.DataFrame(data)], ignore_index=True).to_csv(filename, index=False)
+            print(f"[+] Añadidos {len(data)} registros a '{filename}'.")
+            return
+        with open(filename, 'a', newline='', encoding='utf-8') as f:
+            csv.DictWriter(f, fieldnames=keys).writerows(data)
+        print(f"[+] Añadidos {len(data)} registros a '{filename}'.")
+        return
     with open(filename, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=keys)
         writer.writeheader()
         writer.writerows(data)
     print(f"[+] Guardados {len(data)} registros en '{filename}'.")
 
-def scrape_player(player_id: str):
+# Partidas que se expanden por adelantado mientras se parsea la actual
+EXPAND_AHEAD = 4
+
+# Clic JS en lote: no necesita scroll y es un solo viaje al navegador
+EXPAND_JS = """
+for (const m of arguments[0]) {
+    const btn = m.querySelector('a.match .link-ind');
+    if (btn) btn.click();
+}
+"""
+
+def _text_int(row, selector):
+    return int(row.select_one(selector).get_text(strip=True).replace(",", ""))
+
+def parse_match_rows(html, idx, verbose=True, key=None):
+    """
+    Parsea el HTML (str o nodo de BeautifulSoup) de una partida expandida.
+    Devuelve (filas, errores); los errores conservan el texto crudo de la fila
+    para la cuarentena. `key` es la clave estable del lobby (codigo16.match_key):
+    `match` solo es la posición en el perfil y se repite entre perfiles.
+    """
+    soup = BeautifulSoup(html, "html.parser") if isinstance(html, str) else html
+    entries, errors = [], []
+    for r, row in enumerate(soup.select("tr"), start=1):
+        if row.select_one(".kda") is None:
+            continue  # cabecera de la tabla
+        try:
+            raw_kda = row.select_one(".kda .avg").get_text()
+            k, d, a = [int(x.strip()) for x in raw_kda.split("/")]
+
+            dmg       = _text_int(row, ".stat-value.damage .text")
+            dmg_taken = _text_int(row, ".stat-value.dmg-taken .text")
+            heal      = _text_int(row, ".stat-value.heal .text")
+
+            mvp_flag = row.select_one(".badges .mvp, .badges .svp") is not None
+
+            img = row.select_one(".hero img")
+            if img is not None and img.get("src"):
+                hero_id = img["src"].split("img_selecthero_")[-1].split(".")[0]
+                hero_name = HERO_MAP.get(hero_id, "Desconocido")
+            else:
+                hero_id = None
+                hero_name = "Desconocido"
+
+            role_code = HERO_ROLE_MAP.get(hero_id, 0)
+
+            # Enlace al perfil del jugador de la fila (None si no lo hay)
+            link = row.select_one("a[href*='/player/']")
+            row_player = link["href"].rstrip("/").split("/")[-1] if link else None
+
+            entry = {
+                "match": idx,
+                "match_key": key,
+                "row": r,
+                "kills": k, "deaths": d, "assists": a,
+                "damage": dmg, "dmg_taken": dmg_taken,
+                "healing": heal, "mvp": mvp_flag,
+                "hero_id": hero_id, "hero_name": hero_name,
+                "role": role_code,
+                "player_id": row_player
+            }
+            entries.append(entry)
+            if verbose:
+                print(f"      - {entry}")
+        except Exception as ex:
+            if verbose:
+                print(f"      ! Error fila {r}: {ex}")
+            errors.append({
+                "match": idx, "row": r,
+                "raw": row.get_text(" ", strip=True),
+                "reasons": f"error de parseo: {ex}"
+            })
+    return entries, errors
+
+def parse_player_page(html, verbose=False, player_id=None):
+    """Parsea todas las partidas de una página de jugador ya expandida."""
+    soup = BeautifulSoup(html, "html.parser")
+    entries, errors = [], []
+    for idx, match in enumerate(soup.select("div.matches > div.match-details"), start=1):
+        # Misma clave que MATCH_KEYS_JS, leída del HTML archivado
+        link = match.select_one("a.match")
+        text = (link or match).get_text(" ", strip=True)[:300]
+        key = match_key(link.get("href", "") if link else "", text, player_id)
+        rows, errs = parse_match_rows(match, idx, verbose, key)
+        entries.extend(rows)
+        errors.extend(errs)
+    return entries, errors
+
+def _is_expanded(driver, match):
+    return driver.execute_script("return arguments[0].querySelector('tr') !== null;", match)
+
+def scrape_player(player_id: str, pool=None, seen=None, filename='rivals_data.csv', on_row=(),
+                  percentiles=False):
+    # Import local: codigo15 importa a su vez este módulo (parser)
+    from codigo15 import PageArchive
+
     all_data = []
+    parse_errors = []
     url = f"https://rivalsmeta.com/player/{player_id}"
 
-    opts = uc.ChromeOptions()
-    opts.headless = False
-    opts.add_argument("--window-size=1200,900")
-    driver = uc.Chrome(options=opts)
+    pool = pool or get_pool(lean=True)
+    seen = seen or SeenMatches()
+    driver = pool.acquire()
     wait = WebDriverWait(driver, 12)
+    matches = []    # referencias acumuladas; solo se piden las nuevas
+    todo = []       # (posición, clave) de las partidas no vistas antes
+    done = 0        # partidas de `todo` ya parseadas
 
     try:
         print("[+] Abriendo página:", url)
@@ -76,83 +169,103 @@ def scrape_player(player_id: str):
         print("[*] Esperando 10 s antes de empezar...")
         time.sleep(10)
 
-        idx = 1
+        clicked = 0     # partidas de `todo` a las que ya se envió el clic
+        skipped = 0
         while True:
-            matches = driver.find_elements(By.CSS_SELECTOR, "div.matches > div.match-details")
-            if idx > len(matches):
-                print(f"[*] No hay más partidas ({idx-1} de {len(matches)}).")
-                break
+            if done >= len(todo):
+                # Tras 'Show More' solo se consultan los nodos añadidos
+                new = driver.find_elements(
+                    By.CSS_SELECTOR,
+                    f"div.matches > div.match-details:nth-child(n+{len(matches) + 1})"
+                )
+                if not new:
+                    print(f"[*] No hay más partidas ({len(matches)} cargadas, "
+                          f"{skipped} ya capturadas antes).")
+                    break
+                # Filtrar lobbies ya capturados ANTES de expandirlos
+                keys = [match_key(href, text, player_id)
+                        for href, text in driver.execute_script(MATCH_KEYS_JS, new)]
+                for el, key, claimed in zip(new, keys, seen.claim_many(keys)):
+                    if claimed:
+                        todo.append((len(matches), key))
+                    else:
+                        skipped += 1
+                    matches.append(el)
+                continue
 
-            match = matches[idx - 1]
-            print(f"\n[►] Partida #{idx} de {len(matches)}")
-            driver.execute_script("arguments[0].scrollIntoView(true);", match)
-            time.sleep(0.1)
+            # Expandir por adelantado: la partida N+1.. se renderiza mientras se parsea N
+            ahead = min(done + EXPAND_AHEAD, len(todo))
+            if clicked < ahead:
+                batch = [matches[pos] for pos, _ in todo[clicked:ahead]]
+                driver.execute_script(EXPAND_JS, batch)
+                driver.execute_script("arguments[0].scrollIntoView(true);", batch[-1])
+                clicked = ahead
 
+            pos, key = todo[done]
+            idx = pos + 1
+            match = matches[pos]
+            print(f"\n[►] Partida #{idx} de {len(matches)}")
             try:
-                btn = match.find_element(By.CSS_SELECTOR, "a.match .link-ind")
-                btn.click()
-                wait.until(EC.presence_of_element_located((
-                    By.CSS_SELECTOR,
-                    f"div.matches > div.match-details:nth-child({idx}) tr"
-                )))
-                time.sleep(0.2)
+                wait.until(lambda d: _is_expanded(d, match))
             except Exception as e:
                 print(f"    ! No expandió: {e}")
 
-            rows = match.find_elements(By.CSS_SELECTOR, "tr")
+            # Un solo viaje al navegador por partida; el parseo es local
+            rows, errors = parse_match_rows(match.get_attribute("outerHTML"), idx, key=key)
             print(f"    • {len(rows)} filas extraídas")
-            for r, row in enumerate(rows, start=1):
-                try:
-                    raw_kda = row.find_element(By.CSS_SELECTOR, ".kda .avg").text
-                    k, d, a = [int(x.strip()) for x in raw_kda.split("/")]
-
-                    dmg       = int(row.find_element(By.CSS_SELECTOR, ".stat-value.damage .text")
-                                    .text.replace(",", ""))
-                    dmg_taken = int(row.find_element(By.CSS_SELECTOR, ".stat-value.dmg-taken .text")
-                                    .text.replace(",", ""))
-                    heal      = int(row.find_element(By.CSS_SELECTOR, ".stat-value.heal .text")
-                                    .text.replace(",", ""))
-
-                    try:
-                        row.find_element(By.CSS_SELECTOR, ".badges .mvp, .badges .svp")
-                        mvp_flag = True
-                    except NoSuchElementException:
-                        mvp_flag = False
-
-                    try:
-                        img = row.find_element(By.CSS_SELECTOR, ".hero img").get_attribute("src")
-                        hero_id = img.split("img_selecthero_")[-1].split(".")[0]
-                        hero_name = HERO_MAP.get(hero_id, "Desconocido")
-                    except Exception:
-                        hero_id = None
-                        hero_name = "Desconocido"
-
-                    role_code = HERO_ROLE_MAP.get(hero_id, 0)
-
-                    entry = {
-                        "match": idx,
-                        "row": r,
-                        "kills": k, "deaths": d, "assists": a,
-                        "damage": dmg, "dmg_taken": dmg_taken,
-                        "healing": heal, "mvp": mvp_flag,
-                        "hero_id": hero_id, "hero_name": hero_name,
-                        "role": role_code
-                    }
-                    all_data.append(entry)
-                    print(f"      - {entry}")
-                except Exception as ex:
-                    print(f"      ! Error fila {r}: {ex}")
-
-            idx += 1
-            time.sleep(0.1)
+            # Consumidores en streaming (rating, alertas...): fila a fila
+            for callback in on_row:
+                for entry in rows:
+                    callback(entry)
+            if not rows:
+                seen.release(key)  # que otro intento pueda capturarla
+            all_data.extend(rows)
+            parse_errors.extend(errors)
+
+            done += 1
 
     except Exception as gen:
         print(f"[!] Error inesperado: {gen}")
+        raise  # lo capturado se guarda abajo; quien llama (codigo17) ve el fallo
 
     finally:
-        save_to_csv(all_data)
-        driver.quit()
-        print("[*] Terminado.")
+        # Reclamadas pero sin procesar (error a mitad de bucle): se liberan para
+        # que otro intento o perfil pueda capturarlas
+        pending = [key for _, key in todo[done:]]
+        if pending:
+            seen.release_many(pending)
+            print(f"[*] {len(pending)} partidas reclamadas sin procesar liberadas.")
+        try:
+            # Página expandida al archivo: permite re-parsear sin navegador
+            try:
+                PageArchive().put(driver.page_source, player_id)
+            except Exception as e:
+                print(f"[!] No se pudo archivar la página: {e}")
+            # Nada se pierde: lo que no pasa la validación va a cuarentena
+            write_quarantine(pd.DataFrame(parse_errors))
+            if all_data:
+                valid = validate_and_quarantine(pd.DataFrame(all_data))
+                if percentiles:
+                    # Columnas <stat>_pct_hero / <stat>_pct_role frente al dataset guardado
+                    valid = annotate_percentiles(valid)
+                # Se añade: con el registro de partidas vistas, cada pasada solo trae
+                # los lobbies nuevos y sobrescribir borraría las capturas anteriores
+                save_to_csv(valid.to_dict('records'), filename, append=True)
+            else:
+                save_to_csv(all_data, filename, append=True)
+        finally:
+            # El navegador vuelve al pool aunque falle el post-proceso: con un
+            # solo driver, el siguiente acquire() se quedaría bloqueado
+            pool.release(driver)
+            print("[*] Terminado.")
+    # Partidas encontradas en el perfil (nuevas + ya capturadas); 0 = página vacía
+    return len(matches)
 
 if __name__ == "__main__":
-    scrape_player("1639942319")
+    from codigo21 import AnomalyDetector
+
+    detector = AnomalyDetector.load()
+    try:
+        scrape_player("1639942319", on_row=[detector.observe])
+    finally:
+        detector.save()
@@ -1,10 +1,22 @@
 import pandas as pd
 
+from codigo11 import match_uid
+
 # Lista de nombres de archivo
 files = ['rivals_data1.csv', 'rivals_data2.csv', 'rivals_data3.csv', 'rivals_data4.csv', 'rivals_data5.csv']
 
-# Leer y concatenar todos los archivos
-df_combined = pd.concat([pd.read_csv(file) for file in files], ignore_index=True)
+# Leer y concatenar todos los archivos (match_uid por fichero: los bloques de partida no se mezclan)
+frames = []
+for file in files:
+    df = pd.read_csv(file)
+    df['match_uid'] = match_uid(df)
+    frames.append(df)
+df_combined = pd.concat(frames, ignore_index=True)
+
+# Un lobby aparece en el perfil de cada jugador trackeado que lo jugó: quedarse con una copia
+total = len(df_combined)
+df_combined = df_combined[~df_combined.duplicated(['match_uid', 'row'])].drop(columns='match_uid')
+print(f"[*] Descartadas {total - len(df_combined)} filas de lobbies repetidos entre perfiles")
 
 # Guardar el resultado en un nuevo archivo
 df_combined.to_csv('rivals_data_final.csv', index=False, encoding='utf-8')
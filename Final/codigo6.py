@@ -1,17 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import io
+import sys
+from contextlib import redirect_stdout
+
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.model_selection import train_test_split, cross_validate
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    roc_auc_score, roc_curve, f1_score,
-    brier_score_loss, confusion_matrix
-)
-from sklearn.calibration import calibration_curve
+
+from codigo7 import evaluate_probs, bootstrap_ci
+from codigo8 import select_model
+from codigo11 import add_context_features, CONTEXT_FEATURES
+from codigo13 import validate_batch
+from codigo18 import run_parallel
+from codigo22 import annotate_percentiles, STATS as PCT_STATS
+from codigo24 import profiler, DUMP_DIR
 
 ROLE_MAP = {
     1: 'Vanguard',
@@ -21,25 +25,30 @@ ROLE_MAP = {
 
 
 def analyze_role(df_role, role_name):
+    """Imprime el análisis del rol y devuelve sus resultados para el informe (codigo23)."""
     print(f"\n=== Análisis para rol: {role_name} ===")
     total_rows = df_role.shape[0]
-    unique_rows = df_role.drop_duplicates().shape[0]
+    with profiler.stage('drop_duplicates'):
+        unique_rows = df_role.drop_duplicates().shape[0]
     dup_rows = total_rows - unique_rows
     print(f"Total filas (contando duplicados): {total_rows}")
     print(f"Filas únicas: {unique_rows}")
     print(f"Filas duplicadas (que también se cuentan): {dup_rows}")
 
     # Estadísticas descriptivas
-    stats = df_role[['kills','deaths','assists','damage','dmg_taken','healing']].describe().T
-    stats['median'] = df_role[['kills','deaths','assists','damage','dmg_taken','healing']].median()
+    with profiler.stage('describe'):
+        stats = df_role[['kills','deaths','assists','damage','dmg_taken','healing']].describe().T
+        stats['median'] = df_role[['kills','deaths','assists','damage','dmg_taken','healing']].median()
     print("\nEstadísticas descriptivas:\n", stats)
 
     # Valores faltantes
-    missing = df_role.isnull().sum()
+    with profiler.stage('missing'):
+        missing = df_role.isnull().sum()
     print("\nValores faltantes por columna:\n", missing)
 
     # Correlaciones y multicolinealidad
-    corr = df_role[['kills','deaths','assists','damage','dmg_taken','healing']].corr()
+    with profiler.stage('corr'):
+        corr = df_role[['kills','deaths','assists','damage','dmg_taken','healing']].corr()
     print("\nMatriz de correlaciones:\n", corr)
     high_corr = [
         (i, j, corr.loc[i,j])
@@ -48,25 +57,33 @@ def analyze_role(df_role, role_name):
     ]
     print("\nPares con |ρ| > 0.8:\n", high_corr)
 
-    # Preparación para el modelo
+    # Percentiles frente a la distribución de cada héroe: ¿dónde caen los MVP?
+    pct_cols = [f"{s}_pct_hero" for s in PCT_STATS if f"{s}_pct_hero" in df_role.columns]
+    if pct_cols:
+        with profiler.stage('percentiles'):
+            pct = df_role.groupby('mvp')[pct_cols].median().T
+        print("\nPercentil mediano frente a su héroe (MVP vs resto):\n", pct)
+
+    # Preparación para el modelo (stats de la fila + contexto de su partida)
     features = ['kills','deaths','assists','damage','dmg_taken','healing']
+    features += [c for c in CONTEXT_FEATURES if c in df_role.columns]
     X = df_role[features]
     y = df_role['mvp']
 
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    with profiler.stage('scale_split'):
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X)
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_scaled, y, test_size=0.3, random_state=42, stratify=y
-    )
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_scaled, y, test_size=0.3, random_state=42, stratify=y
+        )
 
-    # Entrenamiento
-    model = LogisticRegression(
-        penalty='l2', class_weight='balanced',
-        solver='liblinear', random_state=42
-    )
-    cross_validate(model, X_train, y_train, cv=5, scoring='roc_auc')
-    model.fit(X_train, y_train)
+    # Entrenamiento: búsqueda de C y class_weight con folds en paralelo.
+    # Con --profile se salta la caché de joblib para medir la búsqueda real;
+    # su cpu_s es solo el del proceso principal: los workers de n_jobs=-1 no cuentan
+    with profiler.stage('select_model', note='sin caché; cpu sin workers n_jobs=-1'
+                        if profiler.enabled else None):
+        model = select_model(X_train, y_train, role_name, use_cache=not profiler.enabled)
 
     intercept = model.intercept_[0]
     coefs = model.coef_[0]
@@ -75,40 +92,22 @@ def analyze_role(df_role, role_name):
     for var, coef in zip(features, coefs):
         print(f"  {var}: {coef:.3f}")
 
-    # Evaluación
-    y_prob = model.predict_proba(X_test)[:,1]
-    y_pred = model.predict(X_test)
-
-    roc_auc = roc_auc_score(y_test, y_prob)
-    fpr, tpr, _ = roc_curve(y_test, y_prob)
-    ks_stat = np.max(np.abs(tpr - fpr))
-    f1 = f1_score(y_test, y_pred)
-    brier = brier_score_loss(y_test, y_prob)
-    tn, fp, fn, tp = confusion_matrix(y_test, y_pred).ravel()
-    sens = tp / (tp + fn)
-    spec = tn / (tn + fp)
-
-    print("\nMétricas de evaluación:")
-    print(f"  ROC-AUC     : {roc_auc:.3f}")
-    print(f"  KS          : {ks_stat:.3f}")
-    print(f"  F1-Score    : {f1:.3f}")
-    print(f"  Brier Score : {brier:.3f}")
-    print(f"  Sensibilidad: {sens:.3f}")
-    print(f"  Especificidad: {spec:.3f}")
-
-    # Gráficas ROC y calibración
-    plt.figure()
-    plt.plot(fpr, tpr, label=f'ROC (AUC={roc_auc:.2f})')
-    plt.plot([0,1],[0,1],'--', label='Aleatorio')
-    plt.title(f'Curva ROC - {role_name}')
-    plt.xlabel('FPR'); plt.ylabel('TPR'); plt.legend(); plt.show()
-
-    prob_true, prob_pred = calibration_curve(y_test, y_prob, n_bins=10)
-    plt.figure()
-    plt.plot(prob_pred, prob_true, marker='o', label='Calibración')
-    plt.plot([0,1],[0,1],'--', label='Perfecta')
-    plt.title(f'Curva de Calibración - {role_name}')
-    plt.xlabel('Prob. predicha'); plt.ylabel('Prob. observada'); plt.legend(); plt.show()
+    # Evaluación (una sola pasada ordenada sobre y_prob)
+    with profiler.stage('evaluate'):
+        y_prob = model.predict_proba(X_test)[:,1]
+        metrics = evaluate_probs(y_test, y_prob, threshold=0.5, n_bins=10)
+    with profiler.stage('bootstrap_ci'):
+        ci = bootstrap_ci(y_test, y_prob, threshold=0.5, n_boot=1000)
+
+    roc_auc = metrics['roc_auc']
+    fpr, tpr = metrics['fpr'], metrics['tpr']
+
+    print("\nMétricas de evaluación (IC 95% bootstrap):")
+    for label, key in [("ROC-AUC     ", 'roc_auc'), ("KS          ", 'ks'),
+                       ("F1-Score    ", 'f1'), ("Brier Score ", 'brier'),
+                       ("Sensibilidad", 'sensitivity'), ("Especificidad", 'specificity')]:
+        lo, hi = ci[key]
+        print(f"  {label}: {metrics[key]:.3f}  [{lo:.3f}, {hi:.3f}]")
 
     # Ecuación
     equation = (
@@ -117,22 +116,82 @@ def analyze_role(df_role, role_name):
     )
     print("\nEcuación del modelo:\n", equation)
 
+    # Las curvas ROC y de calibración las dibuja el informe, no ventanas bloqueantes
+    curves = ('fpr', 'tpr', 'prob_true', 'prob_pred')
+    return {
+        'rows': (total_rows, unique_rows, dup_rows),
+        'stats': stats, 'corr': corr,
+        'pct': pct if pct_cols else None,
+        'features': features, 'intercept': intercept, 'coefs': coefs,
+        'metrics': {k: v for k, v in metrics.items()
+                    if k in curves or k in ci},
+        'ci': ci, 'equation': equation,
+    }
+
+
+def _analyze_shared(columns, idx, role_name):
+    """Worker: toma sus filas de la memoria compartida; devuelve salida impresa y resultados."""
+    out = io.StringIO()
+    with redirect_stdout(out):
+        result = analyze_role(columns.frame(idx), role_name)
+    return out.getvalue(), result
+
+
+def load_dataset(path='rivals_data.csv'):
+    """Carga y preprocesado global: validación, contexto por partida y percentiles."""
+    with profiler.stage('read_csv'):
+        df = pd.read_csv(path)
+    # Validar en vez de imputar: mvp a booleano y filas inválidas fuera
+    with profiler.stage('validate_batch'):
+        df, quarantine = validate_batch(df)
+    if not quarantine.empty:
+        print(f"[!] {len(quarantine)} filas descartadas por validación:")
+        print(quarantine['reasons'].value_counts().to_string())
+    # Features de contexto por partida (solo se calculan las partidas nuevas)
+    with profiler.stage('context_features'):
+        df = add_context_features(df)
+    # Percentil de cada fila frente a su héroe y su rol (referencia en caché)
+    with profiler.stage('annotate_percentiles'):
+        return annotate_percentiles(df).reset_index(drop=True)
+
+
+def fit_roles(df, groups, parallel=False):
+    """`groups` es {rol: posiciones de sus filas}; devuelve {rol: resultados de analyze_role}."""
+    if not parallel:
+        results = {}
+        for name, idx in groups.items():
+            with profiler.stage(f"analyze_role[{name}]"):
+                results[name] = analyze_role(df.iloc[idx], name)
+        return results
+    # Un proceso por rol; el dataset se comparte una vez, no se copia por worker.
+    # Todas las columnas: las tablas impresas coinciden con las de la ejecución en serie
+    results = {}
+    for name, (text, result) in run_parallel(df, groups, _analyze_shared, list(df.columns)).items():
+        print(text, end='')
+        results[name] = result
+    return results
+
 
 def main():
-    # 1. Carga y preprocesado global
-    df = pd.read_csv('rivals_data.csv')
-    # Imputar faltantes con mediana
-    # Imputar faltantes con mediana solo en columnas numéricas
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    df[numeric_cols] = df[numeric_cols].fillna(df[numeric_cols].median())
-
-    # 2. Ejecutar análisis por cada rol
-    for code, name in ROLE_MAP.items():
-        df_role = df[df['role'] == code]
-        if df_role.empty:
-            print(f"\n--- No hay datos para rol: {name} ---")
-            continue
-        analyze_role(df_role, name)
+    # Import local: codigo23 importa a su vez este módulo
+    from codigo23 import build_report
+
+    parallel = '--parallel' in sys.argv
+    if '--profile' in sys.argv:
+        # Tiempo, CPU y pico de memoria por etapa; --profile-dump añade cProfile
+        profiler.enable(DUMP_DIR if '--profile-dump' in sys.argv else None)
+        if parallel:
+            print("[*] --profile: el análisis por rol corre en serie para medir cada etapa.")
+            parallel = False
+
+    with profiler.stage('main'):
+        with profiler.stage('load_dataset'):
+            df = load_dataset()
+        # El informe solo vuelve a ajustar los roles cuyos datos cambiaron
+        # (con --profile, todos: si no, las etapas del análisis no se medirían)
+        build_report(df, fit=lambda groups: fit_roles(df, groups, parallel),
+                     force=profiler.enabled)
+    profiler.report(rows=len(df))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor de métricas de evaluación para clasificadores binarios (MVP sí/no).
+- Ordena las probabilidades una sola vez y deriva de sumas acumuladas:
+  ROC-AUC, curva ROC, KS, matriz de confusión, F1, sensibilidad,
+  especificidad, Brier y bins de calibración.
+- Intervalos de confianza bootstrap remuestreando índices en lotes
+  vectorizados (sin reentrenar ni recorrer réplicas en Python).
+"""
+
+import numpy as np
+
+
+def _sorted_pass(y_true, y_prob):
+    """Orden descendente único y agrupación de probabilidades empatadas."""
+    order = np.argsort(-y_prob, kind="mergesort")
+    ys = y_true[order]
+    ps = y_prob[order]
+    # Último índice de cada grupo de probabilidades iguales
+    group_end = np.r_[np.flatnonzero(np.diff(ps)), ps.size - 1]
+    return order, ys, ps, group_end
+
+
+def evaluate_probs(y_true, y_prob, threshold=0.5, n_bins=10):
+    """
+    Calcula todas las métricas en una pasada sobre las probabilidades ordenadas.
+    `threshold` sigue la convención de `model.predict` (positivo si p > umbral).
+    Devuelve un diccionario con métricas escalares y las curvas ROC/calibración.
+    """
+    y_true = np.asarray(y_true).astype(np.float64).ravel()
+    y_prob = np.asarray(y_prob, dtype=np.float64).ravel()
+    n = y_prob.size
+
+    _, ys, ps, group_end = _sorted_pass(y_true, y_prob)
+    cum_pos = np.cumsum(ys)
+    n_pos = cum_pos[-1]
+    n_neg = n - n_pos
+
+    # Curva ROC: un punto por cada probabilidad distinta
+    tps = cum_pos[group_end]
+    fps = (group_end + 1) - tps
+    tpr = np.r_[0.0, tps / n_pos]
+    fpr = np.r_[0.0, fps / n_neg]
+    thresholds = np.r_[np.inf, ps[group_end]]
+    roc_auc = np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2.0
+    ks_stat = np.max(np.abs(tpr - fpr))
+
+    # Matriz de confusión: las k primeras posiciones son las predichas positivas
+    k = np.searchsorted(-ps, -threshold, side="left")
+    tp = cum_pos[k - 1] if k > 0 else 0.0
+    fp = k - tp
+    fn = n_pos - tp
+    tn = n_neg - fp
+    f1 = 2 * tp / (2 * tp + fp + fn) if tp + fp + fn else 0.0
+    sens = tp / (tp + fn) if tp + fn else np.nan
+    spec = tn / (tn + fp) if tn + fp else np.nan
+
+    brier = np.mean((y_prob - y_true) ** 2)
+
+    # Calibración (bins uniformes, misma convención que calibration_curve):
+    # en orden ascendente los bins son tramos contiguos -> diferencias de cumsum
+    asc_p = ps[::-1]
+    asc_y = ys[::-1]
+    edges = np.linspace(0.0, 1.0, n_bins + 1)
+    cuts = np.r_[0, np.searchsorted(asc_p, edges[1:-1], side="right"), n]
+    cum_p = np.r_[0.0, np.cumsum(asc_p)]
+    cum_y = np.r_[0.0, np.cumsum(asc_y)]
+    bin_total = np.diff(cuts)
+    bin_sums = np.diff(cum_p[cuts])
+    bin_true = np.diff(cum_y[cuts])
+    nonzero = bin_total > 0
+    prob_true = bin_true[nonzero] / bin_total[nonzero]
+    prob_pred = bin_sums[nonzero] / bin_total[nonzero]
+
+    return {
+        "roc_auc": float(roc_auc),
+        "ks": float(ks_stat),
+        "f1": float(f1),
+        "brier": float(brier),
+        "sensitivity": float(sens),
+        "specificity": float(spec),
+        "confusion": (int(tn), int(fp), int(fn), int(tp)),
+        "fpr": fpr, "tpr": tpr, "thresholds": thresholds,
+        "prob_true": prob_true, "prob_pred": prob_pred,
+    }
+
+
+def bootstrap_ci(y_true, y_prob, threshold=0.5, n_boot=1000, alpha=0.05,
+                 batch_size=200, random_state=42):
+    """
+    Intervalos de confianza bootstrap para AUC, KS, F1, Brier, sensibilidad y
+    especificidad. Cada réplica se representa como un vector de conteos sobre
+    las filas originales, así que un lote entero se evalúa con productos de
+    matrices y sumas acumuladas sobre el orden calculado una sola vez.
+    """
+    y_true = np.asarray(y_true).astype(np.float64).ravel()
+    y_prob = np.asarray(y_prob, dtype=np.float64).ravel()
+    n = y_prob.size
+    rng = np.random.default_rng(random_state)
+
+    order, ys, ps, group_end = _sorted_pass(y_true, y_prob)
+    group_start = np.r_[0, group_end[:-1] + 1]
+    pred = (ps > threshold).astype(np.float64)
+    sq_err = (ps - ys) ** 2
+    # Posición de cada fila original dentro del orden
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+
+    names = ["roc_auc", "ks", "f1", "brier", "sensitivity", "specificity"]
+    reps = {name: [] for name in names}
+    done = 0
+    while done < n_boot:
+        b = min(batch_size, n_boot - done)
+        idx = rng.integers(0, n, size=(b, n))
+        flat = (rank[idx] + n * np.arange(b)[:, None]).ravel()
+        w = np.bincount(flat, minlength=b * n).reshape(b, n).astype(np.float64)
+
+        w_pos = w * ys
+        w_neg = w - w_pos
+        # Pesos por grupo de empate (orden descendente)
+        g_pos = np.add.reduceat(w_pos, group_start, axis=1)
+        g_neg = np.add.reduceat(w_neg, group_start, axis=1)
+        P = g_pos.sum(axis=1)
+        N = g_neg.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # AUC: cada positivo gana a los negativos con menor probabilidad
+            neg_below = N[:, None] - np.cumsum(g_neg, axis=1)
+            auc = np.sum(g_pos * (neg_below + 0.5 * g_neg), axis=1) / (P * N)
+            tpr = np.cumsum(g_pos, axis=1) / P[:, None]
+            fpr = np.cumsum(g_neg, axis=1) / N[:, None]
+            ks = np.max(np.abs(tpr - fpr), axis=1)
+
+            tp = w_pos @ pred
+            fp = w_neg @ pred
+            fn = P - tp
+            tn = N - fp
+            f1 = 2 * tp / (2 * tp + fp + fn)
+            sens = tp / (tp + fn)
+            spec = tn / (tn + fp)
+        brier = (w @ sq_err) / n
+
+        for name, vals in zip(names, [auc, ks, f1, brier, sens, spec]):
+            reps[name].append(vals)
+        done += b
+
+    lo, hi = 100 * alpha / 2, 100 * (1 - alpha / 2)
+    ci = {}
+    for name in names:
+        vals = np.concatenate(reps[name])
+        ci[name] = (float(np.nanpercentile(vals, lo)), float(np.nanpercentile(vals, hi)))
+    return ci
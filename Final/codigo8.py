@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Selección de modelo por rol para la regresión logística de MVP.
+- Búsqueda en rejilla sobre C (fuerza de regularización) y class_weight
+- Folds estratificados calculados una vez y reutilizados por cada candidato
+- Candidatos y folds repartidos en todos los núcleos (n_jobs=-1)
+- Resultados memoizados en disco: mismos datos + misma rejilla = instantáneo
+"""
+
+import numpy as np
+import pandas as pd
+from joblib import Memory
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from sklearn.linear_model import LogisticRegression
+
+CACHE_DIR = '.cache_modelos'
+
+PARAM_GRID = {
+    'C': [0.001, 0.01, 0.1, 1.0, 10.0, 100.0],
+    'class_weight': [None, 'balanced'],
+}
+
+_memory = Memory(CACHE_DIR, verbose=0)
+
+
+def make_folds(y, n_splits=5, random_state=42):
+    """Folds estratificados fijos; la misma lista se pasa a todos los candidatos."""
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    return list(skf.split(np.zeros(len(y)), y))
+
+
+@_memory.cache
+def _grid_search(X, y, param_grid, n_splits, random_state):
+    folds = make_folds(y, n_splits, random_state)
+    base = LogisticRegression(penalty='l2', solver='liblinear', random_state=random_state)
+    search = GridSearchCV(
+        base, param_grid, scoring='roc_auc', cv=folds,
+        n_jobs=-1, refit=True
+    )
+    search.fit(X, y)
+    cols = ['param_C', 'param_class_weight', 'mean_test_score', 'std_test_score', 'rank_test_score']
+    results = pd.DataFrame(search.cv_results_)[cols].sort_values('rank_test_score')
+    results['param_class_weight'] = results['param_class_weight'].fillna('None')
+    return search.best_estimator_, search.best_params_, search.best_score_, results
+
+
+def select_model(X_train, y_train, role_name, param_grid=None, n_splits=5, random_state=42,
+                 use_cache=True):
+    """
+    Ejecuta (o recupera de caché) la búsqueda para un rol e imprime las
+    puntuaciones de validación cruzada. Devuelve el estimador reentrenado.
+    Con use_cache=False la búsqueda se ejecuta siempre (p. ej. para perfilarla).
+    """
+    X = np.ascontiguousarray(X_train, dtype=np.float64)
+    y = np.asarray(y_train).astype(int)
+    grid = param_grid or PARAM_GRID
+
+    search = _grid_search if use_cache else _grid_search.func
+    model, params, score, results = search(X, y, grid, n_splits, random_state)
+
+    print(f"\nValidación cruzada ({n_splits} folds, ROC-AUC) - {role_name}:")
+    print(results.head(5).to_string(index=False))
+    print(f"Mejores parámetros: {params}  (AUC CV = {score:.3f})")
+    return model
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pool de navegadores Chrome (undetected-chromedriver) reutilizables.
+- Lanza los navegadores una sola vez y los mantiene calientes
+- Perfil/caché persistente por ranura para que Chrome no arranque en frío
+- Comprobación de salud al prestar y reciclado tras N páginas o si el
+  heap de JavaScript crece por encima de un límite
+- Modo ligero (lean=True): bloquea imágenes, media, fuentes y trackers vía
+  Chrome DevTools Protocol sin tocar el DOM (los atributos `src` siguen ahí)
+Uso:
+    pool = DriverPool(size=1)
+    with pool.driver() as driver:
+        driver.get(url)
+    pool.close()
+"""
+
+import os
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+import undetected_chromedriver as uc
+
+PROFILE_ROOT = '.chrome_profiles'
+
+# Patrones de URL que se bloquean en modo ligero (Network.setBlockedURLs)
+BLOCKED_URL_PATTERNS = [
+    # Imágenes
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fuentes
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Vídeo / audio
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg",
+    # Publicidad y analítica
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*amazon-adsystem.com*",
+    "*facebook.net*", "*hotjar.com*", "*clarity.ms*", "*cloudflareinsights.com*",
+    "*nitropay.com*", "*quantserve.com*", "*scorecardresearch.com*",
+]
+
+
+class DriverPool:
+    def __init__(self, size=1, profile_root=PROFILE_ROOT, max_pages=50,
+                 max_heap_mb=1024, headless=False, window_size="1200,900",
+                 lean=False, blocked_patterns=None):
+        self.size = size
+        self.profile_root = os.path.abspath(profile_root)
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self.headless = headless
+        self.window_size = window_size
+        self.lean = lean
+        self.blocked_patterns = BLOCKED_URL_PATTERNS + list(blocked_patterns or [])
+
+        self._idle = queue.Queue()
+        self._slots = {}   # id(driver) -> ranura
+        self._pages = {}   # id(driver) -> páginas servidas
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Arranque en caliente: se lanzan en serie porque uc parchea el binario
+        for slot in range(size):
+            self._idle.put(self._launch(slot))
+
+    def _launch(self, slot):
+        profile = os.path.join(self.profile_root, f"slot_{slot}")
+        os.makedirs(profile, exist_ok=True)
+
+        opts = uc.ChromeOptions()
+        opts.headless = self.headless
+        opts.add_argument(f"--window-size={self.window_size}")
+        opts.add_argument(f"--disk-cache-dir={os.path.join(profile, 'cache')}")
+        if self.lean:
+            # Sin decodificar imágenes aunque se cuele alguna URL no listada
+            opts.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+            })
+        print(f"[+] Lanzando Chrome (ranura {slot}, perfil '{profile}')")
+        driver = uc.Chrome(options=opts, user_data_dir=profile)
+        if self.lean:
+            self._block_resources(driver)
+
+        with self._lock:
+            self._slots[id(driver)] = slot
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _block_resources(self, driver):
+        """Activa el bloqueo de peticiones; persiste entre navegaciones de la pestaña."""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
+
+    def _forget(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            return self._slots.pop(id(driver))
+
+    def _recycle(self, driver, reason):
+        slot = self._forget(driver)
+        print(f"[*] Reciclando Chrome de la ranura {slot}: {reason}")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        return self._launch(slot)
+
+    def _heap_mb(self, driver):
+        heap = driver.execute_script(
+            "return performance.memory ? performance.memory.usedJSHeapSize : 0;"
+        )
+        return (heap or 0) / (1024 * 1024)
+
+    def _check(self, driver):
+        """Devuelve un driver sano: el mismo si responde, uno nuevo si no."""
+        with self._lock:
+            pages = self._pages[id(driver)]
+        if pages >= self.max_pages:
+            return self._recycle(driver, f"{pages} páginas servidas")
+        try:
+            heap = self._heap_mb(driver)
+        except Exception as e:
+            return self._recycle(driver, f"no responde ({e.__class__.__name__})")
+        if heap > self.max_heap_mb:
+            return self._recycle(driver, f"heap JS de {heap:.0f} MB")
+        return driver
+
+    def acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("El pool de navegadores está cerrado")
+        return self._check(self._idle.get(timeout=timeout))
+
+    def release(self, driver):
+        """Devuelve el driver al pool; cada préstamo cuenta como una página."""
+        with self._lock:
+            self._pages[id(driver)] += 1
+        if self._closed:
+            self._forget(driver)
+            driver.quit()
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        drv = self.acquire(timeout)
+        try:
+            yield drv
+        finally:
+            self.release(drv)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                drv = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._forget(drv)
+            try:
+                drv.quit()
+            except Exception:
+                pass
+
+
+_default_pool = None
+
+
+def get_pool(**kwargs):
+    """Pool compartido del proceso; se crea al primer uso y se cierra al salir."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = DriverPool(**kwargs)
+        atexit.register(_default_pool.close)
+    return _default_pool